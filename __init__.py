@@ -10,11 +10,12 @@ Modules:
     - dashboard: Console monitoring
     - alerts: Telegram notifications
     - run_paper: Main paper trading runner
+    - clock: Cached timestamp formatting
 """
 
 from .data_feed import SimulatedDataFeed, BinanceDataFeed, CandleBuffer
-from .signal_engine import SignalEngine, IndicatorCalculator
-from .paper_trader import PaperTrader, Position, Trade
+from .signal_engine import SignalEngine, IndicatorCalculator, Signal
+from .paper_trader import PaperTrader, Position, Trade, TradeEvent
 from .dashboard import DashboardManager, SimpleDashboard
 from .alerts import AlertManager, TelegramAlert
 
@@ -24,9 +25,11 @@ __all__ = [
     'CandleBuffer',
     'SignalEngine',
     'IndicatorCalculator',
+    'Signal',
     'PaperTrader',
     'Position',
     'Trade',
+    'TradeEvent',
     'DashboardManager',
     'SimpleDashboard',
     'AlertManager',
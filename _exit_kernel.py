@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+                    EXIT KERNEL - POSITION EXIT CHECK
+================================================================================
+Scalar TP / SL / trailing stop / timeout check for one open position,
+compiled with numba when available.
+================================================================================
+"""
+
+try:
+    from live._njit import njit
+except ImportError:
+    from _njit import njit
+
+# Reason codes returned by check_exit
+EXIT_NONE = 0
+EXIT_TP = 1
+EXIT_SL = 2
+EXIT_TRAIL = 3
+EXIT_TIMEOUT = 4
+
+
+@njit(cache=True)
+def check_exit(direction_sign, entry, tp, sl, trail_pct, max_hold,
+               current, max_pnl_pct, hold_candles):
+    """Return (reason code, updated max P&L %) for a position at `current`
+    
+    Checks run in priority order TP, SL, trailing stop, timeout; once the trail
+    is armed (max P&L above trail_pct) the timeout is not checked.
+    """
+    pnl = direction_sign * (current - entry) / entry
+    if pnl > max_pnl_pct:
+        max_pnl_pct = pnl
+    
+    if direction_sign * (current - tp) >= 0.0:
+        return EXIT_TP, max_pnl_pct
+    if direction_sign * (sl - current) >= 0.0:
+        return EXIT_SL, max_pnl_pct
+    if max_pnl_pct > trail_pct:
+        if pnl < max_pnl_pct - trail_pct:
+            return EXIT_TRAIL, max_pnl_pct
+        return EXIT_NONE, max_pnl_pct
+    if hold_candles >= max_hold:
+        return EXIT_TIMEOUT, max_pnl_pct
+    return EXIT_NONE, max_pnl_pct
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+                    NJIT - OPTIONAL NUMBA COMPILATION
+================================================================================
+numba.njit when numba is installed, otherwise a no-op decorator so the
+kernels run as plain Python.
+================================================================================
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit (bare or with options)"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
@@ -9,22 +9,119 @@ Sends trading alerts to Telegram for real-time monitoring.
 
 import logging
 import os
-from datetime import datetime
-from typing import Dict, Optional
-import json
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Dict, Optional
 
 try:
-    import requests
-    REQUESTS_AVAILABLE = True
+    from live.clock import now_hms, now_ymd, now_ymdhms
 except ImportError:
-    REQUESTS_AVAILABLE = False
+    from clock import now_hms, now_ymd, now_ymdhms
+
+if TYPE_CHECKING:
+    from paper_trader import TradeEvent
+    from signal_engine import Signal
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("Alerts")
 
+# Shared HTTP client - keeps the TLS connection to Telegram alive between alerts.
+# Created on first send, so nothing HTTP-related is imported while Telegram is disabled.
+# Prefers httpx with HTTP/2 (needs httpx[http2]), falls back to a pooled requests.Session.
+_HTTP = None
+_HTTP_LOCK = threading.Lock()
+
+
+def _trade_event(data: Dict) -> "TradeEvent":
+    """Wrap an event dict from older callers; paper_trader (numpy) is only imported here"""
+    try:
+        from live.paper_trader import TradeEvent
+    except ImportError:
+        from paper_trader import TradeEvent
+    return TradeEvent.from_dict(data)
+
+
+def _signal(data: Dict) -> "Signal":
+    """Wrap a signal dict from older callers; signal_engine (pandas) is only imported here"""
+    try:
+        from live.signal_engine import Signal
+    except ImportError:
+        from signal_engine import Signal
+    return Signal.from_dict(data)
+
+
+def _get_http():
+    """Return the shared HTTP client, or None if neither httpx nor requests is installed"""
+    global _HTTP
+    if _HTTP is None:
+        with _HTTP_LOCK:
+            if _HTTP is None:
+                try:
+                    import httpx
+                    _HTTP = httpx.Client(http2=True, timeout=10.0,
+                                         limits=httpx.Limits(max_keepalive_connections=4))
+                except ImportError:
+                    try:
+                        import requests
+                    except ImportError:
+                        return None
+                    session = requests.Session()
+                    session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+                    _HTTP = session
+    return _HTTP
+
+
+class _TokenBucket:
+    """Thread-safe token bucket rate limiter"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate  # tokens per second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.ts = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.ts) * self.rate)
+        self.ts = now
+    
+    def available(self) -> float:
+        """Tokens currently available"""
+        with self._lock:
+            self._refill()
+            return self.tokens
+    
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
 
 class TelegramAlert:
-    """Send alerts to Telegram"""
+    """Send alerts to Telegram
+    
+    Messages are queued and posted by a background worker thread so the
+    trading loop never waits on the Telegram API.
+    """
+    
+    # Telegram limits: 30 msg/s per bot, 1 msg/s per chat
+    GLOBAL_RATE = 30.0
+    CHAT_RATE = 1.0
+    
+    # Messages queued within BATCH_WINDOW seconds are combined into one post
+    BATCH_WINDOW = 0.5
+    BATCH_SEPARATOR = "\n\n---\n\n"
+    BATCH_MAX_CHARS = 3500  # Telegram caps a message at 4096 chars
     
     def __init__(self, bot_token: str = None, chat_id: str = None):
         # Try to get from environment variables
@@ -32,29 +129,108 @@ class TelegramAlert:
         self.chat_id = chat_id or os.environ.get("TELEGRAM_CHAT_ID", "")
         
         self.enabled = bool(self.bot_token and self.chat_id)
+        self.url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
+        
+        # Outgoing messages, drained by the worker thread
+        self.queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        
+        # Rate limits, applied by the worker before each post
+        self._global_bucket = _TokenBucket(self.GLOBAL_RATE, self.GLOBAL_RATE)
+        self._chat_bucket = _TokenBucket(self.CHAT_RATE, self.CHAT_RATE)
         
         if not self.enabled:
             logger.warning("Telegram alerts disabled - missing bot token or chat ID")
             logger.info("Set TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID environment variables to enable")
     
     def send(self, message: str) -> bool:
-        """Send message to Telegram"""
+        """Queue message for Telegram (returns immediately)"""
         if not self.enabled:
             logger.info(f"[ALERT] {message}")
             return False
         
-        if not REQUESTS_AVAILABLE:
+        if _get_http() is None:
             logger.error("requests library not installed")
             return False
         
+        self._ensure_worker()
+        self.queue.put_nowait(message)
+        return True
+    
+    def is_saturated(self) -> bool:
+        """True if new messages would have to wait for the rate limit"""
+        return self.queue.qsize() > 0 or self._chat_bucket.available() < 1
+    
+    def close(self, timeout: float = 10.0):
+        """Flush queued messages and stop the worker thread"""
+        worker = self._worker
+        if worker is None or not worker.is_alive():
+            return
+        self.queue.put_nowait(None)
+        worker.join(timeout=timeout)
+    
+    def _ensure_worker(self):
+        """Start the worker thread on first use"""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._drain, name="TelegramAlert", daemon=True)
+                self._worker.start()
+    
+    def _drain(self):
+        """Worker loop - post queued messages until a None sentinel arrives"""
+        while True:
+            message = self.queue.get()
+            if message is None:
+                return
+            batch, stop = self._collect(message)
+            for text in self._combine(batch):
+                self._chat_bucket.acquire()
+                self._global_bucket.acquire()
+                self._post(text)
+            if stop:
+                return
+    
+    def _collect(self, first: str):
+        """Gather messages queued within BATCH_WINDOW of the first one"""
+        batch = [first]
+        deadline = time.monotonic() + self.BATCH_WINDOW
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return batch, False
+            try:
+                message = self.queue.get(timeout=remaining)
+            except queue.Empty:
+                return batch, False
+            if message is None:
+                return batch, True
+            batch.append(message)
+    
+    def _combine(self, batch: list) -> list:
+        """Join messages with separators, splitting before BATCH_MAX_CHARS"""
+        chunks = []
+        current = ""
+        for message in batch:
+            if current and len(current) + len(self.BATCH_SEPARATOR) + len(message) > self.BATCH_MAX_CHARS:
+                chunks.append(current)
+                current = message
+            else:
+                current = current + self.BATCH_SEPARATOR + message if current else message
+        chunks.append(current)
+        return chunks
+    
+    def _post(self, message: str) -> bool:
+        """Post a single message to Telegram (blocking)"""
         try:
-            url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
             data = {
                 "chat_id": self.chat_id,
                 "text": message,
                 "parse_mode": "HTML"
             }
-            response = requests.post(url, data=data, timeout=10)
+            response = _HTTP.post(self.url, data=data, timeout=10)
             
             if response.status_code == 200:
                 return True
@@ -67,117 +243,189 @@ class TelegramAlert:
             return False
 
 
+@dataclass(slots=True)
+class DailyStats:
+    """Closed-trade counters for the current day"""
+    trades: int = 0
+    wins: int = 0
+    losses: int = 0
+    pnl: float = 0.0
+
+
 class AlertManager:
     """Manages trading alerts"""
     
+    # Repeat signals within this window are dropped while Telegram is saturated
+    SIGNAL_COALESCE_SECS = 60.0
+    
+    # Message templates (filled with str.format_map)
+    _SIGNAL_TMPL = (
+        "<b>SIGNAL</b>\n"
+        "Symbol: {symbol}\n"
+        "Direction: {signal}\n"
+        "Price: ${price:.2f}\n"
+        "Conviction: {conviction:.0%}\n"
+        "Time: {time}"
+    )
+    _OPEN_TMPL = (
+        "<b>POSITION OPENED</b>\n"
+        "Symbol: {symbol}\n"
+        "Direction: {direction}\n"
+        "Entry: ${entry_price:.2f}\n"
+        "Margin: ${margin:.2f}\n"
+        "Leverage: {leverage}x\n"
+        "Time: {time}"
+    )
+    _CLOSE_TMPL = (
+        "<b>POSITION CLOSED - {result}</b>\n"
+        "Symbol: {symbol}\n"
+        "Direction: {direction}\n"
+        "Exit: ${exit_price:.2f}\n"
+        "Reason: {reason}\n"
+        "P&L: {sign}${pnl:.2f}\n"
+        "\n"
+        "<b>Daily Stats</b>\n"
+        "Trades: {day_trades}\n"
+        "W/L: {day_wins}/{day_losses}\n"
+        "Daily P&L: ${day_pnl:.2f}"
+    )
+    _SUMMARY_TMPL = (
+        "<b>DAILY SUMMARY</b>\n"
+        "Date: {date}\n"
+        "\n"
+        "Total Trades: {total_trades}\n"
+        "Win Rate: {win_rate}%\n"
+        "Profit Factor: {profit_factor}\n"
+        "Total P&L: ${total_pnl}\n"
+        "Balance: ${balance}\n"
+        "Return: {return_pct}%"
+    )
+    _SUMMARY_DEFAULTS = {
+        "total_trades": 0,
+        "win_rate": 0,
+        "profit_factor": 0,
+        "total_pnl": 0,
+        "balance": 0,
+        "return_pct": 0
+    }
+    _STARTUP_TMPL = (
+        "<b>PAPER TRADING STARTED</b>\n"
+        "Symbols: {symbols}\n"
+        "Balance: ${balance:.2f}\n"
+        "Time: {time}"
+    )
+    
     def __init__(self, telegram: TelegramAlert = None):
         self.telegram = telegram or TelegramAlert()
-        self.daily_stats = {
-            "trades": 0,
-            "wins": 0,
-            "losses": 0,
-            "pnl": 0.0
-        }
+        self.last_signal_sent: Dict[str, tuple] = {}  # symbol -> (signal, monotonic time)
+        self.daily_stats = DailyStats()
         self.last_reset = datetime.now().date()
+        self._next_reset_ts = self._midnight_after(self.last_reset)
+    
+    @staticmethod
+    def _midnight_after(day) -> float:
+        """Epoch time of the local midnight that ends `day` (DST-aware)"""
+        return datetime.combine(day + timedelta(days=1), datetime.min.time()).timestamp()
     
     def _check_day_reset(self):
         """Reset daily stats at midnight"""
+        if time.time() < self._next_reset_ts:
+            return
         today = datetime.now().date()
         if today != self.last_reset:
-            self.daily_stats = {
-                "trades": 0,
-                "wins": 0,
-                "losses": 0,
-                "pnl": 0.0
-            }
+            self.daily_stats = DailyStats()
             self.last_reset = today
+        self._next_reset_ts = self._midnight_after(today)
     
-    def on_signal(self, signal: Dict):
+    def on_signal(self, signal: "Signal"):
         """Alert on new trading signal"""
-        if signal.get('signal') in ['BUY', 'SELL']:
-            msg = (
-                f"<b>SIGNAL</b>\n"
-                f"Symbol: {signal['symbol']}\n"
-                f"Direction: {signal['signal']}\n"
-                f"Price: ${signal.get('price', 0):.2f}\n"
-                f"Conviction: {signal.get('conviction', 0):.0%}\n"
-                f"Time: {datetime.now().strftime('%H:%M:%S')}"
-            )
-            self.telegram.send(msg)
-    
-    def on_trade_open(self, data: Dict):
+        if isinstance(signal, dict):
+            signal = _signal(signal)
+        if signal.signal in ['BUY', 'SELL']:
+            # Coalesce: skip a repeat of the last signal while the queue is backed up
+            now = time.monotonic()
+            last = self.last_signal_sent.get(signal.symbol)
+            if (last and last[0] == signal.signal
+                    and now - last[1] < self.SIGNAL_COALESCE_SECS
+                    and self.telegram.is_saturated()):
+                return
+            self.last_signal_sent[signal.symbol] = (signal.signal, now)
+            
+            self.telegram.send(self._SIGNAL_TMPL.format_map({
+                "symbol": signal.symbol,
+                "signal": signal.signal,
+                "price": signal.price,
+                "conviction": signal.conviction,
+                "time": now_hms()
+            }))
+    
+    def on_trade_open(self, data: "TradeEvent"):
         """Alert on position opened"""
-        msg = (
-            f"<b>POSITION OPENED</b>\n"
-            f"Symbol: {data['symbol']}\n"
-            f"Direction: {data['direction']}\n"
-            f"Entry: ${data['entry_price']:.2f}\n"
-            f"Margin: ${data['margin']:.2f}\n"
-            f"Leverage: {data['leverage']}x\n"
-            f"Time: {datetime.now().strftime('%H:%M:%S')}"
-        )
-        self.telegram.send(msg)
+        if isinstance(data, dict):
+            data = _trade_event(data)
+        self.telegram.send(self._OPEN_TMPL.format_map({
+            "symbol": data.symbol,
+            "direction": data.direction,
+            "entry_price": data.entry_price,
+            "margin": data.margin,
+            "leverage": data.leverage,
+            "time": now_hms()
+        }))
     
-    def on_trade_close(self, data: Dict):
+    def on_trade_close(self, data: "TradeEvent"):
         """Alert on position closed"""
+        if isinstance(data, dict):
+            data = _trade_event(data)
         self._check_day_reset()
         
-        pnl = data['pnl']
+        pnl = data.pnl
         
-        self.daily_stats['trades'] += 1
-        self.daily_stats['pnl'] += pnl
+        ds = self.daily_stats
+        ds.trades += 1
+        ds.pnl += pnl
         if pnl > 0:
-            self.daily_stats['wins'] += 1
+            ds.wins += 1
         else:
-            self.daily_stats['losses'] += 1
-        
-        emoji = "+" if pnl >= 0 else ""
-        result = "WIN" if pnl >= 0 else "LOSS"
+            ds.losses += 1
         
-        msg = (
-            f"<b>POSITION CLOSED - {result}</b>\n"
-            f"Symbol: {data['symbol']}\n"
-            f"Direction: {data['direction']}\n"
-            f"Exit: ${data['exit_price']:.2f}\n"
-            f"Reason: {data['reason']}\n"
-            f"P&L: {emoji}${pnl:.2f}\n"
-            f"\n"
-            f"<b>Daily Stats</b>\n"
-            f"Trades: {self.daily_stats['trades']}\n"
-            f"W/L: {self.daily_stats['wins']}/{self.daily_stats['losses']}\n"
-            f"Daily P&L: ${self.daily_stats['pnl']:.2f}"
-        )
-        self.telegram.send(msg)
+        self.telegram.send(self._CLOSE_TMPL.format_map({
+            "result": "WIN" if pnl >= 0 else "LOSS",
+            "symbol": data.symbol,
+            "direction": data.direction,
+            "exit_price": data.exit_price,
+            "reason": data.reason,
+            "sign": "+" if pnl >= 0 else "",
+            "pnl": pnl,
+            "day_trades": ds.trades,
+            "day_wins": ds.wins,
+            "day_losses": ds.losses,
+            "day_pnl": ds.pnl
+        }))
     
     def send_daily_summary(self, stats: Dict):
         """Send daily trading summary"""
-        msg = (
-            f"<b>DAILY SUMMARY</b>\n"
-            f"Date: {datetime.now().strftime('%Y-%m-%d')}\n"
-            f"\n"
-            f"Total Trades: {stats.get('total_trades', 0)}\n"
-            f"Win Rate: {stats.get('win_rate', 0)}%\n"
-            f"Profit Factor: {stats.get('profit_factor', 0)}\n"
-            f"Total P&L: ${stats.get('total_pnl', 0)}\n"
-            f"Balance: ${stats.get('balance', 0)}\n"
-            f"Return: {stats.get('return_pct', 0)}%"
-        )
-        self.telegram.send(msg)
+        self.telegram.send(self._SUMMARY_TMPL.format_map({
+            **self._SUMMARY_DEFAULTS,
+            **stats,
+            "date": now_ymd()
+        }))
     
     def send_error(self, error_msg: str):
         """Send error alert"""
         msg = f"<b>ERROR</b>\n{error_msg}"
         self.telegram.send(msg)
     
+    def close(self):
+        """Flush pending alerts (call before exiting)"""
+        self.telegram.close()
+    
     def send_startup(self, symbols: list, balance: float):
         """Send startup notification"""
-        msg = (
-            f"<b>PAPER TRADING STARTED</b>\n"
-            f"Symbols: {', '.join(symbols)}\n"
-            f"Balance: ${balance:.2f}\n"
-            f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        )
-        self.telegram.send(msg)
+        self.telegram.send(self._STARTUP_TMPL.format_map({
+            "symbols": ", ".join(symbols),
+            "balance": balance,
+            "time": now_ymdhms()
+        }))
 
 
 class ConsoleAlert:
@@ -186,17 +434,23 @@ class ConsoleAlert:
     def __init__(self):
         pass
     
-    def on_signal(self, signal: Dict):
-        if signal.get('signal') in ['BUY', 'SELL']:
-            print(f"\n*** SIGNAL: {signal['symbol']} {signal['signal']} @ ${signal.get('price', 0):.2f} ***\n")
+    def on_signal(self, signal: "Signal"):
+        if isinstance(signal, dict):
+            signal = _signal(signal)
+        if signal.signal in ['BUY', 'SELL']:
+            print(f"\n*** SIGNAL: {signal.symbol} {signal.signal} @ ${signal.price:.2f} ***\n")
     
-    def on_trade_open(self, data: Dict):
-        print(f"\n>>> OPENED {data['direction']} {data['symbol']} @ ${data['entry_price']:.2f}")
+    def on_trade_open(self, data: "TradeEvent"):
+        if isinstance(data, dict):
+            data = _trade_event(data)
+        print(f"\n>>> OPENED {data.direction} {data.symbol} @ ${data.entry_price:.2f}")
     
-    def on_trade_close(self, data: Dict):
-        pnl = data['pnl']
+    def on_trade_close(self, data: "TradeEvent"):
+        if isinstance(data, dict):
+            data = _trade_event(data)
+        pnl = data.pnl
         emoji = "+" if pnl >= 0 else ""
-        print(f"\n<<< CLOSED {data['symbol']} | {data['reason']} | P&L: {emoji}${pnl:.2f}")
+        print(f"\n<<< CLOSED {data.symbol} | {data.reason} | P&L: {emoji}${pnl:.2f}")
 
 
 if __name__ == "__main__":
@@ -229,4 +483,5 @@ if __name__ == "__main__":
         "reason": "TP"
     })
     
+    alert.close()
     print("\nAlert test complete!")
@@ -8,12 +8,14 @@ Runs the paper trading bot in background and displays live stats.
 ================================================================================
 """
 
-import gradio as gr
 import threading
 import time
 import os
 import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Dict, Tuple
 
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -23,15 +25,20 @@ try:
     from live.data_feed import SimulatedDataFeed
     from live.signal_engine import SignalEngine
     from live.paper_trader import PaperTrader
+    from live.clock import now_hms, now_str
 except ImportError:
     from data_feed import SimulatedDataFeed
     from signal_engine import SignalEngine
     from paper_trader import PaperTrader
+    from clock import now_hms, now_str
 
 
 class TradingBotDashboard:
     """Web dashboard for the trading bot"""
     
+    STATUS_CACHE_TTL = 2.0  # seconds
+    NONTRADE_LOG_EVERY = 10  # log repeated "waiting" messages every Nth tick
+    
     def __init__(self, balance=100000.0, min_lev=10, max_lev=50):
         self.symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "XAUUSDT", "XAGUSDT"]
         self.balance = balance
@@ -46,18 +53,24 @@ class TradingBotDashboard:
         # State
         self.running = False
         self.thread = None
+        self._stop_event = threading.Event()  # current run's stop signal; a new one per start
+        self.executor = None  # per-symbol worker pool
+        self.trade_lock = threading.Lock()  # guards paper_trader
         self.last_update = None
-        self.logs = []
-        self.signals_log = []
-        self.trades_log = []
+        self.logs = deque(maxlen=100)
+        self.signals_log = deque(maxlen=500)
+        self.trades_log = deque(maxlen=500)
+        self._last_nontrade_log: Dict[str, Tuple[Tuple[str, str], int]] = {}  # symbol -> (state, repeats)
+        
+        # get_status() result cache, shared across dashboard viewers
+        self._status_cache = None
+        self._status_cache_ts = 0.0
+        self._status_cache_key = None
         
     def log(self, msg):
         """Add to logs"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        entry = f"[{timestamp}] {msg}"
+        entry = f"[{now_hms()}] {msg}"
         self.logs.append(entry)
-        if len(self.logs) > 100:
-            self.logs = self.logs[-100:]
         print(entry)
     
     def start_bot(self):
@@ -100,8 +113,12 @@ class TradingBotDashboard:
                     data_status.append(f"{sym}: ❌ No data")
             self.log(f"Data status: {', '.join(data_status)}")
             
+            # Fresh Event per run: a previous loop still stuck in a fetch keeps
+            # its own (set) Event and exits instead of resuming on this run
+            self._stop_event = threading.Event()
             self.running = True
-            self.thread = threading.Thread(target=self._run_loop, daemon=True)
+            self.executor = ThreadPoolExecutor(max_workers=len(self.symbols), thread_name_prefix="symbol")
+            self.thread = threading.Thread(target=self._run_loop, args=(self._stop_event,), daemon=True)
             self.thread.start()
             
             self.log(f"✅ Bot started! Trading {', '.join(self.symbols)}")
@@ -115,80 +132,104 @@ class TradingBotDashboard:
             self.log(f"   Traceback: {traceback.format_exc()}")
             return f"❌ Error: {e}"
     
-    def _run_loop(self):
-        """Background trading loop"""
+    def _run_loop(self, stop_event: threading.Event):
+        """Background trading loop; runs until this run's stop_event is set"""
         poll_interval = 60  # seconds
         
-        while self.running:
+        while not stop_event.is_set():
             try:
                 # Fetch latest data
                 self.data_feed.fetch_latest()
+                if stop_event.is_set():
+                    return
                 self.last_update = datetime.now()
                 
-                # Process each symbol
-                for symbol in self.symbols:
-                    self._process_symbol(symbol)
+                # Exit checks for all open positions in one batch, then
+                # the signal path for the remaining symbols concurrently
+                exits = self._check_exits()
+                pending = [s for s in self.symbols if s not in exits]
+                for _ in self.executor.map(self._process_symbol, pending):
+                    pass
                 
-                # Wait for next poll
-                time.sleep(poll_interval)
+                # Wait for next poll (returns early when stopped)
+                if stop_event.wait(poll_interval):
+                    return
                 
             except Exception as e:
                 self.log(f"⚠️ Error in loop: {e}")
-                time.sleep(10)
+                if stop_event.wait(10):
+                    return
     
-    def _process_symbol(self, symbol: str):
-        """Process trading logic for a symbol"""
-        df_1h = self.data_feed.get_dataframe(symbol, "1h")
-        df_15m = self.data_feed.get_dataframe(symbol, "15m")
-        
-        if df_1h is None or df_15m is None:
-            self.log(f"⚠️ {symbol}: No data available")
-            return
+    def _check_exits(self) -> Dict[str, str]:
+        """Update all open positions at the latest prices; returns symbol -> exit reason"""
+        prices = self.data_feed.get_latest_batch(self.symbols, "15m")
+        with self.trade_lock:
+            exits = self.paper_trader.update_positions(prices, datetime.now().isoformat())
         
+        for symbol, exit_reason in exits.items():
+            self.log(f"🔴 CLOSED {symbol} - Reason: {exit_reason}")
+            self.trades_log.append({
+                'time': now_str("%Y-%m-%d %H:%M"),
+                'symbol': symbol,
+                'action': 'CLOSE',
+                'reason': exit_reason
+            })
+        return exits
+    
+    def _process_symbol(self, symbol: str):
+        """Process trading logic for a symbol (exits are handled by _check_exits)"""
         latest = self.data_feed.get_latest(symbol, "15m")
         if not latest:
             return
             
         current_price = latest['close']
         
-        # Check existing position
-        if self.paper_trader.has_position(symbol):
-            exit_reason = self.paper_trader.update_position(symbol, current_price)
-            if exit_reason:
-                pos = self.paper_trader.get_position(symbol)
-                self.log(f"🔴 CLOSED {symbol} - Reason: {exit_reason}")
-                self.trades_log.append({
-                    'time': datetime.now().strftime("%Y-%m-%d %H:%M"),
-                    'symbol': symbol,
-                    'action': 'CLOSE',
-                    'reason': exit_reason
-                })
-        else:
+        with self.trade_lock:
+            has_position = self.paper_trader.has_position(symbol)
+        
+        if not has_position:
+            # DataFrames are only built for the signal engine
+            df_1h = self.data_feed.get_dataframe(symbol, "1h")
+            df_15m = self.data_feed.get_dataframe(symbol, "15m")
+            
+            if df_1h is None or df_15m is None:
+                self.log(f"⚠️ {symbol}: No data available")
+                return
+            
             # Generate signal
             signal = self.signal_engine.process(symbol, df_1h, df_15m)
             
             # Log signal status for visibility
-            direction = signal.get('direction', 'NEUTRAL')
-            sig_type = signal['signal']
+            direction = signal.direction
+            sig_type = signal.signal
             
             if sig_type in ['BUY', 'SELL']:
-                signal['price'] = current_price
-                signal['atr_pct'] = 1.0
-                self.paper_trader.open_position(signal)
+                signal.price = current_price
+                signal.atr_pct = 1.0
+                with self.trade_lock:
+                    self.paper_trader.open_position(signal)
+                self._last_nontrade_log.pop(symbol, None)
                 
                 emoji = "🟢 LONG" if sig_type == 'BUY' else "🔴 SHORT"
-                self.log(f"{emoji} {symbol} @ ${current_price:,.2f} (score: {signal.get('score', 0)}/5)")
+                self.log(f"{emoji} {symbol} @ ${current_price:,.2f} (score: {signal.score}/5)")
                 
                 self.signals_log.append({
-                    'time': datetime.now().strftime("%Y-%m-%d %H:%M"),
+                    'time': now_str("%Y-%m-%d %H:%M"),
                     'symbol': symbol,
                     'signal': sig_type,
                     'price': current_price,
-                    'confidence': signal.get('confidence', 0)
+                    'confidence': signal.conviction
                 })
             else:
-                # Log why we're not trading (periodically, not every tick)
-                reason = signal.get('reason', 'Conditions not met')
+                # Log why we're not trading (on change, then every Nth repeat)
+                reason = signal.reason
+                state = (direction, reason)
+                last = self._last_nontrade_log.get(symbol)
+                repeats = last[1] + 1 if last and last[0] == state else 0
+                self._last_nontrade_log[symbol] = (state, repeats)
+                if repeats % self.NONTRADE_LOG_EVERY:
+                    return
+                
                 if direction != 'NEUTRAL':
                     self.log(f"📊 {symbol}: {direction} trend, waiting for entry ({reason})")
                 else:
@@ -197,15 +238,40 @@ class TradingBotDashboard:
     def stop_bot(self):
         """Stop the trading bot"""
         self.running = False
+        self._stop_event.set()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=2)
+        if self.executor:
+            self.executor.shutdown(wait=False)
+        if self.paper_trader:
+            self.paper_trader.stop()
+        self._status_cache = None
+        self._status_cache_key = None
         self.log("🛑 Bot stopped")
         return "🛑 Bot stopped"
     
     def get_status(self):
-        """Get current bot status"""
+        """Get current bot status (cached for STATUS_CACHE_TTL seconds)"""
         if not self.running:
             return "🔴 Bot is not running", "", "", ""
         
-        stats = self.paper_trader.get_stats() if self.paper_trader else {}
+        key = (self.last_update, self.running, id(self.paper_trader))
+        if (key == self._status_cache_key
+                and time.monotonic() - self._status_cache_ts < self.STATUS_CACHE_TTL):
+            return self._status_cache
+        
+        result = self._build_status()
+        self._status_cache = result
+        self._status_cache_key = key
+        self._status_cache_ts = time.monotonic()
+        return result
+    
+    def _build_status(self):
+        """Build the status, P&L, positions and logs displays"""
+        stats = {}
+        if self.paper_trader:
+            with self.trade_lock:
+                stats = self.paper_trader.get_stats()
         
         # Build status display
         status = "🟢 Bot is running"
@@ -227,100 +293,111 @@ class TradingBotDashboard:
 """
         
         # Build positions display
-        positions = []
+        positions_display = ""
         if self.paper_trader:
-            for symbol in self.symbols:
-                pos = self.paper_trader.get_position(symbol)
-                if pos:
-                    latest = self.data_feed.get_latest(symbol, "15m") if self.data_feed else None
-                    current_price = latest['close'] if latest else pos.entry_price
-                    pnl_pct = ((current_price - pos.entry_price) / pos.entry_price * 100)
-                    if pos.direction == "SHORT":
-                        pnl_pct = -pnl_pct
-                    positions.append(f"• **{symbol}** {pos.direction} @ ${pos.entry_price:,.2f} → ${current_price:,.2f} ({pnl_pct:+.2f}%)")
-        
-        positions_display = "\n".join(positions) if positions else "No open positions"
+            # One batch lookup of latest prices instead of one per position
+            latest_prices = self.data_feed.get_latest_batch(self.symbols, "15m") if self.data_feed else {}
+            # Positions are opened / closed by the executor workers under trade_lock
+            with self.trade_lock:
+                positions_display = "\n".join(filter(None, (self._fmt_position(s, latest_prices) for s in self.symbols)))
+        positions_display = positions_display or "No open positions"
         
         # Build logs display
-        logs_display = "\n".join(self.logs[-20:]) if self.logs else "No logs yet"
+        logs_display = "\n".join(list(self.logs)[-20:]) if self.logs else "No logs yet"
         
         return status, pnl_display, positions_display, logs_display
     
+    def _fmt_position(self, symbol: str, latest_prices: Dict[str, float]):
+        """Format one open position for the status panel (None if flat); caller holds trade_lock"""
+        pos = self.paper_trader.get_position(symbol)
+        if not pos:
+            return None
+        current_price = latest_prices.get(symbol) or pos.entry_price
+        pnl_pct = (current_price - pos.entry_price) / pos.entry_price * 100
+        if pos.direction == "SELL":
+            pnl_pct = -pnl_pct
+        return f"• **{symbol}** {pos.direction} @ ${pos.entry_price:,.2f} → ${current_price:,.2f} ({pnl_pct:+.2f}%)"
+    
     def get_logs(self):
         """Get recent logs"""
-        return "\n".join(self.logs[-50:]) if self.logs else "No logs yet"
-
-
-# Initialize dashboard
-print("=" * 60)
-print("  PAPER TRADING BOT - HUGGING FACE DEPLOYMENT")
-print("=" * 60)
-
-# Get config from environment or use defaults
-BALANCE = float(os.environ.get("STARTING_BALANCE", "100000"))
-MIN_LEV = int(os.environ.get("MIN_LEVERAGE", "10"))
-MAX_LEV = int(os.environ.get("MAX_LEVERAGE", "50"))
-
-dashboard = TradingBotDashboard(balance=BALANCE, min_lev=MIN_LEV, max_lev=MAX_LEV)
+        return "\n".join(list(self.logs)[-50:]) if self.logs else "No logs yet"
 
-# Auto-start the bot
-dashboard.start_bot()
 
-
-# Create Gradio interface
-with gr.Blocks(title="Crypto Paper Trading Bot", theme=gr.themes.Soft()) as app:
-    gr.Markdown("""
-    # 🤖 Crypto & Precious Metals Trading Bot
-    
-    Real-time paper trading on **BTC, ETH, SOL, Gold, Silver** using multi-timeframe analysis.
-    """)
+def build_app(dashboard: TradingBotDashboard):
+    """Build the Gradio interface (gradio is imported here so headless imports stay light)"""
+    import gradio as gr
     
-    with gr.Row():
-        with gr.Column(scale=2):
-            status_display = gr.Markdown("Loading...")
-            pnl_display = gr.Markdown("Loading P&L...")
+    with gr.Blocks(title="Crypto Paper Trading Bot", theme=gr.themes.Soft()) as app:
+        gr.Markdown("""
+        # 🤖 Crypto & Precious Metals Trading Bot
         
-        with gr.Column(scale=1):
-            positions_display = gr.Markdown("Loading positions...")
-    
-    with gr.Accordion("📋 Activity Logs", open=False):
-        logs_display = gr.Textbox(
-            label="Recent Activity",
-            lines=15,
-            interactive=False
+        Real-time paper trading on **BTC, ETH, SOL, Gold, Silver** using multi-timeframe analysis.
+        """)
+        
+        with gr.Row():
+            with gr.Column(scale=2):
+                status_display = gr.Markdown("Loading...")
+                pnl_display = gr.Markdown("Loading P&L...")
+            
+            with gr.Column(scale=1):
+                positions_display = gr.Markdown("Loading positions...")
+        
+        with gr.Accordion("📋 Activity Logs", open=False):
+            logs_display = gr.Textbox(
+                label="Recent Activity",
+                lines=15,
+                interactive=False
+            )
+        
+        with gr.Row():
+            refresh_btn = gr.Button("🔄 Refresh", variant="primary")
+            stop_btn = gr.Button("🛑 Stop Bot", variant="stop")
+            start_btn = gr.Button("▶️ Start Bot", variant="secondary")
+        
+        # Auto-refresh every 30 seconds
+        def refresh():
+            return dashboard.get_status()
+        
+        refresh_btn.click(
+            fn=refresh,
+            outputs=[status_display, pnl_display, positions_display, logs_display]
+        )
+        
+        stop_btn.click(
+            fn=dashboard.stop_bot,
+            outputs=[status_display]
+        )
+        
+        start_btn.click(
+            fn=dashboard.start_bot,
+            outputs=[status_display]
+        )
+        
+        # Load initial status
+        app.load(
+            fn=refresh,
+            outputs=[status_display, pnl_display, positions_display, logs_display]
         )
     
-    with gr.Row():
-        refresh_btn = gr.Button("🔄 Refresh", variant="primary")
-        stop_btn = gr.Button("🛑 Stop Bot", variant="stop")
-        start_btn = gr.Button("▶️ Start Bot", variant="secondary")
-    
-    # Auto-refresh every 30 seconds
-    def refresh():
-        return dashboard.get_status()
+    return app
+
+
+if __name__ == "__main__":
+    # Initialize dashboard
+    print("=" * 60)
+    print("  PAPER TRADING BOT - HUGGING FACE DEPLOYMENT")
+    print("=" * 60)
     
-    refresh_btn.click(
-        fn=refresh,
-        outputs=[status_display, pnl_display, positions_display, logs_display]
-    )
+    # Get config from environment or use defaults
+    BALANCE = float(os.environ.get("STARTING_BALANCE", "100000"))
+    MIN_LEV = int(os.environ.get("MIN_LEVERAGE", "10"))
+    MAX_LEV = int(os.environ.get("MAX_LEVERAGE", "50"))
     
-    stop_btn.click(
-        fn=dashboard.stop_bot,
-        outputs=[status_display]
-    )
+    dashboard = TradingBotDashboard(balance=BALANCE, min_lev=MIN_LEV, max_lev=MAX_LEV)
     
-    start_btn.click(
-        fn=dashboard.start_bot,
-        outputs=[status_display]
-    )
+    # Auto-start the bot
+    dashboard.start_bot()
     
-    # Load initial status
-    app.load(
-        fn=refresh,
-        outputs=[status_display, pnl_display, positions_display, logs_display]
-    )
-
-
-if __name__ == "__main__":
-    # Launch on port 7860 (Hugging Face default)
+    # Create Gradio interface and launch on port 7860 (Hugging Face default)
+    app = build_app(dashboard)
     app.launch(server_name="0.0.0.0", server_port=7860)
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+                    CLOCK - CACHED TIMESTAMPS
+================================================================================
+Formatted wall-clock timestamps for logs, alerts and the dashboard.
+Each format is rendered with strftime at most once per second.
+================================================================================
+"""
+
+import time
+from datetime import datetime, tzinfo
+from typing import Dict, Optional, Tuple
+
+# (format, tz) -> (epoch second, formatted string)
+_cache: Dict[Tuple[str, Optional[tzinfo]], Tuple[int, str]] = {}
+
+
+def now_str(fmt: str, tz: Optional[tzinfo] = None) -> str:
+    """datetime.now(tz).strftime(fmt), cached for the current second"""
+    sec = int(time.time())
+    key = (fmt, tz)
+    hit = _cache.get(key)
+    if hit is not None and hit[0] == sec:
+        return hit[1]
+    text = datetime.now(tz).strftime(fmt)
+    _cache[key] = (sec, text)
+    return text
+
+
+def now_hms() -> str:
+    """Current local time as HH:MM:SS"""
+    return now_str('%H:%M:%S')
+
+
+def now_ymd() -> str:
+    """Current local date as YYYY-MM-DD"""
+    return now_str('%Y-%m-%d')
+
+
+def now_ymdhms() -> str:
+    """Current local time as YYYY-MM-DD HH:MM:SS"""
+    return now_str('%Y-%m-%d %H:%M:%S')
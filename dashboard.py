@@ -9,38 +9,59 @@ Console-based dashboard for monitoring paper trading in real-time.
 
 import os
 import sys
-from datetime import datetime, timezone, timedelta
-from typing import Dict, List
+from collections import deque
+from datetime import timezone, timedelta
+from typing import TYPE_CHECKING, Deque, Dict
+
+try:
+    from live.clock import now_hms, now_str
+except ImportError:
+    from clock import now_hms, now_str
+
+if TYPE_CHECKING:
+    from paper_trader import TradeEvent
+    from signal_engine import Signal
 
 # IST timezone (UTC+5:30)
 IST = timezone(timedelta(hours=5, minutes=30))
 
-# Cross-platform terminal handling
-try:
-    import curses
-    CURSES_AVAILABLE = True
-except ImportError:
-    CURSES_AVAILABLE = False
+# Enable ANSI escape processing on Windows consoles
+if os.name == 'nt':
+    os.system('')
 
 
 def clear_screen():
-    """Clear terminal screen"""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    """Clear terminal screen (ANSI erase + cursor home)"""
+    if sys.stdout.isatty():
+        sys.stdout.write("\x1b[H\x1b[2J")
+        sys.stdout.flush()
 
 
 class SimpleDashboard:
     """Simple text-based dashboard (no curses required)"""
     
+    # Row templates, built once instead of per-frame f-strings
+    _RULE = "=" * 80
+    _SECTION = "-" * 80
+    _SUBRULE = "  " + "-" * 60
+    _SIG_HEADER = f"  {'Symbol':<12} {'Signal':<8} {'Direction':<10} {'Price':<12} {'Score'}"
+    _SIG_ROW = "  {sym:<12} {sig:<8} {direction:<10} ${price:<11.2f} {score}"
+    _SIG_LABELS = {'BUY': '[BUY]', 'SELL': '[SELL]'}
+    _POS_HEADER = f"  {'Symbol':<12} {'Dir':<6} {'Entry':<12} {'Current':<12} {'P&L%':<8} {'Hold'}"
+    _POS_ROW = "  {sym:<12} {direction:<6} ${entry:<11.2f} ${current:<11.2f} {pnl:<8} {hold}"
+    _TRADE_HEADER = f"  {'Symbol':<12} {'Dir':<6} {'P&L':<10} {'Reason':<10} {'Time'}"
+    _TRADE_ROW = "  {sym:<12} {direction:<6} {pnl:<10} {reason:<10} {time}"
+    
     def __init__(self, starting_balance: float = 100000.0):
         self.last_update = None
-        self.signals: Dict[str, Dict] = {}
+        self.signals: Dict[str, "Signal"] = {}
         self.positions: Dict[str, Dict] = {}
-        self.trades: List[Dict] = []
+        self.trades: Deque[Dict] = deque(maxlen=10)
         self.stats: Dict = {}
         self.balance = starting_balance
         self.starting_balance = starting_balance
     
-    def update_signal(self, symbol: str, signal: Dict):
+    def update_signal(self, symbol: str, signal: "Signal"):
         """Update signal display"""
         self.signals[symbol] = signal
     
@@ -54,8 +75,6 @@ class SimpleDashboard:
     def add_trade(self, trade: Dict):
         """Add trade to history"""
         self.trades.append(trade)
-        if len(self.trades) > 10:
-            self.trades = self.trades[-10:]
     
     def update_stats(self, stats: Dict):
         """Update trading statistics"""
@@ -65,52 +84,49 @@ class SimpleDashboard:
     def render(self):
         """Render dashboard to console"""
         clear_screen()
+        out = []
         
-        now = datetime.now(IST).strftime("%Y-%m-%d %H:%M:%S IST")
+        now = now_str("%Y-%m-%d %H:%M:%S IST", IST)
         
-        print("=" * 80)
-        print(f"  PAPER TRADING DASHBOARD                         {now}")
-        print("=" * 80)
+        out.append(self._RULE)
+        out.append(f"  PAPER TRADING DASHBOARD                         {now}")
+        out.append(self._RULE)
         
         # Balance and stats
         ret = self.stats.get('return_pct', 0)
         ret_str = f"+{ret}%" if ret >= 0 else f"{ret}%"
-        print(f"\n  Balance: ${self.balance:.2f} ({ret_str})")
-        print(f"  Trades: {self.stats.get('total_trades', 0)} | "
-              f"Win Rate: {self.stats.get('win_rate', 0)}% | "
-              f"PF: {self.stats.get('profit_factor', 0)}")
+        out.append(f"\n  Balance: ${self.balance:.2f} ({ret_str})")
+        out.append(f"  Trades: {self.stats.get('total_trades', 0)} | "
+                   f"Win Rate: {self.stats.get('win_rate', 0)}% | "
+                   f"PF: {self.stats.get('profit_factor', 0)}")
         
         # Current signals
-        print("\n" + "-" * 80)
-        print("  SIGNALS")
-        print("-" * 80)
-        print(f"  {'Symbol':<12} {'Signal':<8} {'Direction':<10} {'Price':<12} {'Score'}")
-        print("  " + "-" * 60)
+        out.append("\n" + self._SECTION)
+        out.append("  SIGNALS")
+        out.append(self._SECTION)
+        out.append(self._SIG_HEADER)
+        out.append(self._SUBRULE)
         
+        sig_row = self._SIG_ROW.format
         for sym, sig in self.signals.items():
-            signal = sig.get('signal', 'HOLD')
-            direction = sig.get('direction', '-')
-            price = sig.get('price', 0)
-            score = sig.get('score', 0)
-            
-            if signal == 'BUY':
-                sig_str = '[BUY]'
-            elif signal == 'SELL':
-                sig_str = '[SELL]'
-            else:
-                sig_str = 'HOLD'
-            
-            print(f"  {sym:<12} {sig_str:<8} {direction:<10} ${price:<11.2f} {score}")
+            out.append(sig_row(
+                sym=sym,
+                sig=self._SIG_LABELS.get(sig.signal, 'HOLD'),
+                direction=sig.direction or '-',
+                price=sig.price,
+                score=sig.score
+            ))
         
         # Open positions
-        print("\n" + "-" * 80)
-        print("  OPEN POSITIONS")
-        print("-" * 80)
+        out.append("\n" + self._SECTION)
+        out.append("  OPEN POSITIONS")
+        out.append(self._SECTION)
         
         if self.positions:
-            print(f"  {'Symbol':<12} {'Dir':<6} {'Entry':<12} {'Current':<12} {'P&L%':<8} {'Hold'}")
-            print("  " + "-" * 60)
+            out.append(self._POS_HEADER)
+            out.append(self._SUBRULE)
             
+            pos_row = self._POS_ROW.format
             for sym, pos in self.positions.items():
                 entry = pos.get('entry_price', 0)
                 current = pos.get('current_price', entry)
@@ -124,20 +140,21 @@ class SimpleDashboard:
                 
                 pnl_str = f"+{pnl_pct:.2f}%" if pnl_pct >= 0 else f"{pnl_pct:.2f}%"
                 
-                print(f"  {sym:<12} {direction:<6} ${entry:<11.2f} ${current:<11.2f} {pnl_str:<8} {hold}")
+                out.append(pos_row(sym=sym, direction=direction, entry=entry, current=current, pnl=pnl_str, hold=hold))
         else:
-            print("  No open positions")
+            out.append("  No open positions")
         
         # Recent trades
-        print("\n" + "-" * 80)
-        print("  RECENT TRADES")
-        print("-" * 80)
+        out.append("\n" + self._SECTION)
+        out.append("  RECENT TRADES")
+        out.append(self._SECTION)
         
         if self.trades:
-            print(f"  {'Symbol':<12} {'Dir':<6} {'P&L':<10} {'Reason':<10} {'Time'}")
-            print("  " + "-" * 60)
+            out.append(self._TRADE_HEADER)
+            out.append(self._SUBRULE)
             
-            for trade in reversed(self.trades[-5:]):
+            trade_row = self._TRADE_ROW.format
+            for trade in reversed(list(self.trades)[-5:]):
                 sym = trade.get('symbol', '-')
                 direction = trade.get('direction', '-')
                 pnl = trade.get('pnl', 0)
@@ -146,13 +163,16 @@ class SimpleDashboard:
                 
                 pnl_str = f"+${pnl:.2f}" if pnl >= 0 else f"-${abs(pnl):.2f}"
                 
-                print(f"  {sym:<12} {direction:<6} {pnl_str:<10} {reason:<10} {time}")
+                out.append(trade_row(sym=sym, direction=direction, pnl=pnl_str, reason=reason, time=time))
         else:
-            print("  No trades yet")
+            out.append("  No trades yet")
+        
+        out.append("\n" + self._RULE)
+        out.append("  Press Ctrl+C to stop")
+        out.append(self._RULE)
         
-        print("\n" + "=" * 80)
-        print("  Press Ctrl+C to stop")
-        print("=" * 80)
+        sys.stdout.write("\n".join(out) + "\n")
+        sys.stdout.flush()
 
 
 class DashboardManager:
@@ -161,22 +181,34 @@ class DashboardManager:
     def __init__(self, starting_balance: float = 100000.0):
         self.dashboard = SimpleDashboard(starting_balance)
     
-    def on_signal(self, signal: Dict):
+    def on_signal(self, signal: "Signal"):
         """Handle signal update"""
-        self.dashboard.update_signal(signal['symbol'], signal)
+        if isinstance(signal, dict):
+            try:
+                from live.signal_engine import Signal
+            except ImportError:
+                from signal_engine import Signal
+            signal = Signal.from_dict(signal)
+        self.dashboard.update_signal(signal.symbol, signal)
     
     def on_position_update(self, symbol: str, position: Dict):
         """Handle position update"""
         self.dashboard.update_position(symbol, position)
     
-    def on_trade(self, trade: Dict):
+    def on_trade(self, trade: "TradeEvent"):
         """Handle trade completion"""
+        if isinstance(trade, dict):
+            try:
+                from live.paper_trader import TradeEvent
+            except ImportError:
+                from paper_trader import TradeEvent
+            trade = TradeEvent.from_dict(trade)
         self.dashboard.add_trade({
-            'symbol': trade.get('symbol'),
-            'direction': trade.get('direction'),
-            'pnl': trade.get('pnl', 0),
-            'reason': trade.get('reason'),
-            'time': datetime.now().strftime('%H:%M:%S')
+            'symbol': trade.symbol,
+            'direction': trade.direction,
+            'pnl': trade.pnl,
+            'reason': trade.reason,
+            'time': now_hms()
         })
     
     def on_stats_update(self, stats: Dict):
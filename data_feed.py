@@ -9,10 +9,13 @@ Connects to Binance WebSocket for 15m and 1hr candles.
 """
 
 import asyncio
+import functools
 import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 import pandas as pd
 import numpy as np
 
@@ -22,7 +25,23 @@ try:
 except ImportError:
     WEBSOCKETS_AVAILABLE = False
 
+# libuv-based event loop (optional, not available on Windows)
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# Fast JSON decoding for WebSocket frames (stdlib json fallback)
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import os
 
 # Get API keys from environment (optional - not needed for public data)
@@ -45,6 +64,50 @@ logger = logging.getLogger("DataFeed")
 BINANCE_FUTURES_API = "https://fapi.binance.com"
 CRYPTOCOMPARE_API = "https://min-api.cryptocompare.com"
 
+# Concurrent REST fetches (symbol x timeframe) and a shared keep-alive session for them.
+# Transient failures (timeouts, 429, 5xx) are retried with jittered exponential backoff.
+MAX_FETCH_WORKERS = 16
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    backoff_jitter=0.3,
+    status_forcelist=[429, 500, 502, 503, 504],
+    allowed_methods=["GET"],
+    raise_on_status=False
+)
+
+
+def _safe_call(callback: Callable, *args):
+    """Run a candle callback, logging (not raising) its errors"""
+    try:
+        callback(*args)
+    except Exception as e:
+        logger.error(f"Callback error: {e}")
+
+
+def _pooled_adapter() -> HTTPAdapter:
+    """Keep-alive connection pool sized for concurrent fetches, with retries"""
+    return HTTPAdapter(pool_connections=MAX_FETCH_WORKERS, pool_maxsize=MAX_FETCH_WORKERS, max_retries=_RETRY)
+
+
+def _pool_client_session(client):
+    """Mount the pooled adapter on python-binance's own requests session"""
+    session = getattr(client, "session", None)
+    if isinstance(session, requests.Session):
+        session.mount("https://", _pooled_adapter())
+
+
+_SESSION = requests.Session()
+_SESSION.mount("https://", _pooled_adapter())
+
+
+def run_event_loop(main):
+    """Run a coroutine to completion, on uvloop when it is installed"""
+    if UVLOOP_AVAILABLE:
+        return uvloop.run(main)
+    return asyncio.run(main)
+
+
 def fetch_klines_rest(symbol: str, interval: str, limit: int = 200) -> list:
     """Fetch klines using direct REST API (fallback method)"""
     url = f"{BINANCE_FUTURES_API}/fapi/v1/klines"
@@ -54,7 +117,7 @@ def fetch_klines_rest(symbol: str, interval: str, limit: int = 200) -> list:
         "limit": limit
     }
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = _SESSION.get(url, params=params, timeout=30)
         if response.status_code == 200:
             return response.json()
         elif response.status_code == 451:
@@ -97,7 +160,7 @@ def fetch_klines_cryptocompare(symbol: str, interval: str, limit: int = 200) ->
     }
     
     try:
-        response = requests.get(url, params=params, timeout=30)
+        response = _SESSION.get(url, params=params, timeout=30)
         if response.status_code == 200:
             data = response.json()
             if data.get("Response") == "Success":
@@ -125,83 +188,268 @@ def fetch_klines_cryptocompare(symbol: str, interval: str, limit: int = 200) ->
         return []
 
 
+def _parse_klines(klines: list) -> Tuple[np.ndarray, np.ndarray]:
+    """Convert REST kline rows to (timestamps int64[n], ohlcv float64[n, 5]) in one pass"""
+    arr = np.asarray(klines, dtype=object)[:, :6]
+    return arr[:, 0].astype(np.int64), arr[:, 1:6].astype(np.float64)
+
+
+class _CandleRing:
+    """Fixed-size OHLCV ring buffer kept as parallel numpy arrays (one per column)"""
+    
+    __slots__ = ("capacity", "head", "size", "version", "timestamp", "open", "high", "low", "close", "volume")
+    
+    COLUMNS = ("timestamp", "open", "high", "low", "close", "volume")
+    
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.head = 0  # next slot to write
+        self.size = 0
+        self.version = 0  # bumped on every write, used to invalidate cached DataFrames
+        self.timestamp = np.zeros(capacity, dtype=np.int64)
+        self.open = np.zeros(capacity, dtype=np.float64)
+        self.high = np.zeros(capacity, dtype=np.float64)
+        self.low = np.zeros(capacity, dtype=np.float64)
+        self.close = np.zeros(capacity, dtype=np.float64)
+        self.volume = np.zeros(capacity, dtype=np.float64)
+    
+    @property
+    def last(self) -> int:
+        """Slot index of the newest candle"""
+        return (self.head - 1) % self.capacity
+    
+    def write(self, i: int, ts: int, o: float, h: float, l: float, c: float, v: float):
+        self.version += 1
+        self.timestamp[i] = ts
+        self.open[i] = o
+        self.high[i] = h
+        self.low[i] = l
+        self.close[i] = c
+        self.volume[i] = v
+    
+    def append(self, ts: int, o: float, h: float, l: float, c: float, v: float):
+        self.write(self.head, ts, o, h, l, c, v)
+        self.head = (self.head + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+    
+    def write_rows(self, idx, ts: np.ndarray, ohlcv: np.ndarray):
+        self.version += 1
+        self.timestamp[idx] = ts
+        self.open[idx] = ohlcv[:, 0]
+        self.high[idx] = ohlcv[:, 1]
+        self.low[idx] = ohlcv[:, 2]
+        self.close[idx] = ohlcv[:, 3]
+        self.volume[idx] = ohlcv[:, 4]
+    
+    def extend(self, ts: np.ndarray, ohlcv: np.ndarray):
+        """Append many candles (oldest first), keeping only the newest `capacity`"""
+        n = len(ts)
+        if n == 0:
+            return
+        if n > self.capacity:
+            ts, ohlcv = ts[-self.capacity:], ohlcv[-self.capacity:]
+            n = self.capacity
+        self.write_rows((self.head + np.arange(n)) % self.capacity, ts, ohlcv)
+        self.head = (self.head + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+    
+    def ordered(self, column: np.ndarray) -> np.ndarray:
+        """Column values oldest -> newest"""
+        if self.size < self.capacity:
+            return column[:self.size]
+        if self.head == 0:
+            return column
+        return np.concatenate((column[self.head:], column[:self.head]))
+    
+    def row(self, i: int) -> Dict:
+        return {
+            'timestamp': int(self.timestamp[i]),
+            'open': float(self.open[i]),
+            'high': float(self.high[i]),
+            'low': float(self.low[i]),
+            'close': float(self.close[i]),
+            'volume': float(self.volume[i])
+        }
+
+
 class CandleBuffer:
     """Buffer to store candles and provide pandas-ready data"""
     
-    def __init__(self, max_candles: int = 500):
+    def __init__(self, max_candles: int = 500, symbols: Sequence[str] = (), timeframes: Sequence[str] = ()):
         self.max_candles = max_candles
-        self.data: Dict[str, Dict[str, List]] = {}  # symbol -> timeframe -> candles
+        # symbol -> timeframe -> candles; known series are allocated up front so
+        # writers only index into existing rings and never grow the outer dicts
+        self.data: Dict[str, Dict[str, _CandleRing]] = {
+            symbol: {tf: _CandleRing(max_candles) for tf in timeframes} for symbol in symbols
+        }
+        self._df_cache: Dict[Tuple[str, str, bool], Tuple[int, pd.DataFrame]] = {}  # -> (ring version, df)
     
-    def add_candle(self, symbol: str, timeframe: str, candle: Dict):
-        """Add a new candle to the buffer"""
+    def _ring(self, symbol: str, timeframe: str) -> _CandleRing:
+        try:
+            return self.data[symbol][timeframe]
+        except KeyError:
+            pass
         if symbol not in self.data:
             self.data[symbol] = {}
         if timeframe not in self.data[symbol]:
-            self.data[symbol][timeframe] = []
-        
-        candles = self.data[symbol][timeframe]
+            self.data[symbol][timeframe] = _CandleRing(self.max_candles)
+        return self.data[symbol][timeframe]
+    
+    def add_candle(self, symbol: str, timeframe: str, ts: int,
+                   o: float, h: float, l: float, c: float, v: float):
+        """Add a new candle to the buffer (scalars go straight into the column arrays)"""
+        ring = self._ring(symbol, timeframe)
         
         # Check if this updates the last candle or is new
-        if candles and candles[-1]['timestamp'] == candle['timestamp']:
-            candles[-1] = candle  # Update
+        if ring.size and ring.timestamp[ring.last] == ts:
+            ring.write(ring.last, ts, o, h, l, c, v)  # Update
         else:
-            candles.append(candle)  # New candle
-            if len(candles) > self.max_candles:
-                candles.pop(0)
+            ring.append(ts, o, h, l, c, v)  # New candle (overwrites the oldest when full)
     
-    def get_dataframe(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
-        """Get candles as DataFrame"""
+    def bulk_add(self, symbol: str, timeframe: str, ts: np.ndarray, ohlcv: np.ndarray):
+        """Add a batch of candles (sorted oldest first, as returned by the REST API)
+        
+        Candles older than the newest buffered one are already held and are skipped;
+        a candle matching the newest timestamp updates it in place.
+        """
+        ring = self._ring(symbol, timeframe)
+        
+        if ring.size:
+            last_ts = ring.timestamp[ring.last]
+            start = int(np.searchsorted(ts, last_ts))
+            if start < len(ts) and ts[start] == last_ts:
+                ring.write_rows([ring.last], ts[start:start + 1], ohlcv[start:start + 1])
+                start += 1
+            ts, ohlcv = ts[start:], ohlcv[start:]
+        
+        ring.extend(ts, ohlcv)
+    
+    def get_dataframe(self, symbol: str, timeframe: str, parse_time: bool = False) -> Optional[pd.DataFrame]:
+        """Get candles as DataFrame
+        
+        Timestamps stay as int64 epoch milliseconds unless parse_time=True.
+        The frame is cached until the next candle write and shared between callers,
+        so treat it as read-only (copy before adding columns).
+        """
         if symbol not in self.data or timeframe not in self.data[symbol]:
             return None
         
-        candles = self.data[symbol][timeframe]
-        if not candles:
+        ring = self.data[symbol][timeframe]
+        if not ring.size:
             return None
         
-        df = pd.DataFrame(candles)
-        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        key = (symbol, timeframe, parse_time)
+        version = ring.version
+        cached = self._df_cache.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        # Columnar construction, no per-row boxing. pd.DataFrame copies the columns
+        # (once per ring version), so the cached frame is unaffected by later ring
+        # writes - the identity-keyed 1h cache in SignalEngine relies on it; keep
+        # the copy (no copy=False)
+        df = pd.DataFrame({col: ring.ordered(getattr(ring, col)) for col in _CandleRing.COLUMNS})
+        if parse_time:
+            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        self._df_cache[key] = (version, df)
         return df
     
     def get_latest(self, symbol: str, timeframe: str) -> Optional[Dict]:
         """Get the latest candle"""
         if symbol not in self.data or timeframe not in self.data[symbol]:
             return None
-        candles = self.data[symbol][timeframe]
-        return candles[-1] if candles else None
+        ring = self.data[symbol][timeframe]
+        return ring.row(ring.last) if ring.size else None
+    
+    def get_latest_closes(self, symbols: List[str], timeframe: str) -> Dict[str, float]:
+        """Get the latest close for several symbols (symbols without data are omitted)"""
+        closes = {}
+        for symbol in symbols:
+            ring = self.data.get(symbol, {}).get(timeframe)
+            if ring is not None and ring.size:
+                closes[symbol] = float(ring.close[ring.last])
+        return closes
 
 
 class BinanceDataFeed:
     """Real-time data feed from Binance"""
     
     BINANCE_WS_URL = "wss://fstream.binance.com/ws"
+    EMIT_INTERVAL = 0.2  # min seconds between in-progress emits per stream (closed candles always go out)
     
     def __init__(self, symbols: List[str], timeframes: List[str] = ["15m", "1h"]):
         self.symbols = [s.lower() for s in symbols]
         self.timeframes = timeframes
-        self.buffer = CandleBuffer()
-        self.callbacks: List[Callable] = []
+        self.buffer = CandleBuffer(symbols=[s.upper() for s in symbols], timeframes=timeframes)
+        self.callbacks: Tuple[Callable, ...] = ()  # rebuilt by add_callback
+        self._safe_cbs: Tuple[Callable, ...] = ()  # callbacks pre-wrapped in _safe_call
         self.running = False
         self.ws = None
         
+        # Streams with in-progress kline updates waiting to be fanned out
+        self._pending: Dict[Tuple[str, str], None] = {}
+        self._flush_scheduled = False
+        self._last_emit: Dict[Tuple[str, str], float] = {}
+        
         # REST client for initial data
         self.client = None
         if BINANCE_AVAILABLE:
             try:
                 self.client = Client("", "", {"timeout": 30})
+                _pool_client_session(self.client)
             except:
                 pass
     
     def add_callback(self, callback: Callable):
         """Add callback for new candle events"""
-        self.callbacks.append(callback)
+        self.callbacks = self.callbacks + (callback,)
+        self._safe_cbs = self._safe_cbs + (functools.partial(_safe_call, callback),)
     
     def _notify_callbacks(self, symbol: str, timeframe: str, candle: Dict, is_closed: bool):
-        """Notify all callbacks of new candle"""
-        for cb in self.callbacks:
-            try:
-                cb(symbol, timeframe, candle, is_closed)
-            except Exception as e:
-                logger.error(f"Callback error: {e}")
+        """Notify all callbacks of new candle (errors are handled by the _safe_call wrappers)"""
+        cbs = self._safe_cbs
+        if len(cbs) == 1:
+            # Common case: a single subscriber, no loop
+            cbs[0](symbol, timeframe, candle, is_closed)
+            return
+        for cb in cbs:
+            cb(symbol, timeframe, candle, is_closed)
+    
+    def _dispatch(self, symbol: str, timeframe: str, is_closed: bool):
+        """Fan out a kline update (already written to the buffer) to callbacks
+        
+        Closed candles go out immediately. In-progress updates are coalesced per
+        (symbol, timeframe) and flushed via call_soon, i.e. once the loop goes idle -
+        a burst of buffered frames is drained first and only the newest state is sent.
+        On top of that, in-progress updates are throttled to one per EMIT_INTERVAL per
+        stream; the buffer itself is always current. The candle dict handed to
+        callbacks is built from the buffer at that point.
+        """
+        key = (symbol, timeframe)
+        now = time.monotonic()
+        if is_closed:
+            self._pending.pop(key, None)
+            self._last_emit[key] = now
+            self._notify_callbacks(symbol, timeframe, self.buffer.get_latest(symbol, timeframe), True)
+            return
+        
+        if key in self._pending:
+            return
+        if now - self._last_emit.get(key, 0.0) < self.EMIT_INTERVAL:
+            return  # tick noise - skip the fan-out
+        self._last_emit[key] = now
+        self._pending[key] = None
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush_pending)
+    
+    def _flush_pending(self):
+        """Notify callbacks of the latest in-progress candle per stream"""
+        pending, self._pending = self._pending, {}
+        self._flush_scheduled = False
+        for symbol, timeframe in pending:
+            self._notify_callbacks(symbol, timeframe, self.buffer.get_latest(symbol, timeframe), False)
     
     def fetch_initial_data(self, days: int = 7):
         """Fetch historical data to initialize buffers"""
@@ -211,57 +459,55 @@ class BinanceDataFeed:
         
         logger.info("Fetching initial historical data...")
         
+        jobs = []
         for symbol in self.symbols:
-            symbol_upper = symbol.upper()
             for tf in self.timeframes:
+                # Calculate limit based on timeframe
+                if tf == "15m":
+                    limit = min(days * 96, 500)
+                elif tf == "1h":
+                    limit = min(days * 24, 500)
+                else:
+                    limit = 200
+                jobs.append((symbol.upper(), tf, limit))
+        
+        # Requests run concurrently; results are inserted on this thread as they arrive
+        with ThreadPoolExecutor(max_workers=max(1, min(MAX_FETCH_WORKERS, len(jobs)))) as pool:
+            futures = {
+                pool.submit(self.client.futures_klines, symbol=symbol_upper, interval=tf, limit=limit): (symbol_upper, tf)
+                for symbol_upper, tf, limit in jobs
+            }
+            for future in as_completed(futures):
+                symbol_upper, tf = futures[future]
                 try:
-                    # Calculate limit based on timeframe
-                    if tf == "15m":
-                        limit = min(days * 96, 500)
-                    elif tf == "1h":
-                        limit = min(days * 24, 500)
-                    else:
-                        limit = 200
+                    klines = future.result()
                     
-                    klines = self.client.futures_klines(
-                        symbol=symbol_upper,
-                        interval=tf,
-                        limit=limit
-                    )
-                    
-                    for k in klines:
-                        candle = {
-                            'timestamp': k[0],
-                            'open': float(k[1]),
-                            'high': float(k[2]),
-                            'low': float(k[3]),
-                            'close': float(k[4]),
-                            'volume': float(k[5])
-                        }
-                        self.buffer.add_candle(symbol_upper, tf, candle)
+                    if klines:
+                        ts, ohlcv = _parse_klines(klines)
+                        self.buffer.bulk_add(symbol_upper, tf, ts, ohlcv)
                     
                     logger.info(f"Loaded {len(klines)} {tf} candles for {symbol_upper}")
                     
                 except Exception as e:
                     logger.error(f"Error fetching {symbol_upper} {tf}: {e}")
     
-    def _parse_kline_message(self, msg: Dict) -> Optional[Dict]:
-        """Parse WebSocket kline message"""
-        if 'k' not in msg:
+    async def fetch_initial_data_async(self, days: int = 7):
+        """Fetch historical data without blocking the event loop"""
+        await asyncio.to_thread(self.fetch_initial_data, days)
+    
+    def _parse_kline_message(self, msg: Dict) -> Optional[Tuple]:
+        """Parse WebSocket kline message
+        
+        Returns (symbol, timeframe, is_closed, timestamp, open, high, low, close, volume).
+        """
+        k = msg.get('k')
+        if k is None:
             return None
         
-        k = msg['k']
-        return {
-            'symbol': k['s'],
-            'timeframe': k['i'],
-            'timestamp': k['t'],
-            'open': float(k['o']),
-            'high': float(k['h']),
-            'low': float(k['l']),
-            'close': float(k['c']),
-            'volume': float(k['v']),
-            'is_closed': k['x']
-        }
+        return (
+            k['s'], k['i'], k['x'], k['t'],
+            float(k['o']), float(k['h']), float(k['l']), float(k['c']), float(k['v'])
+        )
     
     async def _connect(self):
         """Connect to WebSocket with automatic reconnection"""
@@ -287,7 +533,9 @@ class BinanceDataFeed:
             try:
                 logger.info(f"Connecting to WebSocket...")
                 
-                async with websockets.connect(url, ping_interval=20, ping_timeout=10) as ws:
+                # Kline frames are small JSON - permessage-deflate costs more CPU than it saves
+                async with websockets.connect(url, ping_interval=20, ping_timeout=10,
+                                              compression=None, max_size=2**20) as ws:
                     self.ws = ws
                     self.running = True
                     retry_count = 0  # Reset on successful connection
@@ -295,8 +543,11 @@ class BinanceDataFeed:
                     
                     while self.running:
                         try:
-                            msg = await asyncio.wait_for(ws.recv(), timeout=30)
-                            data = json.loads(msg)
+                            # Raw bytes straight to the JSON parser (no UTF-8 decode to str first).
+                            # Keepalive is the library's ping_interval/ping_timeout - a dead
+                            # connection closes and recv() raises, which triggers a reconnect.
+                            msg = await ws.recv(decode=False)
+                            data = json_loads(msg)
                             
                             # Handle combined stream format
                             if 'data' in data:
@@ -304,24 +555,10 @@ class BinanceDataFeed:
                             
                             parsed = self._parse_kline_message(data)
                             if parsed:
-                                symbol = parsed['symbol']
-                                tf = parsed['timeframe']
-                                
-                                candle = {
-                                    'timestamp': parsed['timestamp'],
-                                    'open': parsed['open'],
-                                    'high': parsed['high'],
-                                    'low': parsed['low'],
-                                    'close': parsed['close'],
-                                    'volume': parsed['volume']
-                                }
+                                symbol, tf, is_closed, *ohlcv = parsed
+                                self.buffer.add_candle(symbol, tf, *ohlcv)
+                                self._dispatch(symbol, tf, is_closed)
                                 
-                                self.buffer.add_candle(symbol, tf, candle)
-                                self._notify_callbacks(symbol, tf, candle, parsed['is_closed'])
-                                
-                        except asyncio.TimeoutError:
-                            # Send ping to keep alive
-                            await ws.ping()
                         except Exception as e:
                             logger.error(f"Message error: {e}")
                             break  # Break inner loop to reconnect
@@ -348,7 +585,7 @@ class BinanceDataFeed:
         self.fetch_initial_data()
         
         # Start WebSocket
-        asyncio.run(self._connect())
+        run_event_loop(self._connect())
     
     async def start_async(self):
         """Start the data feed (async)"""
@@ -356,7 +593,7 @@ class BinanceDataFeed:
             logger.error("websockets library not installed")
             return
         
-        self.fetch_initial_data()
+        await self.fetch_initial_data_async()
         await self._connect()
     
     def stop(self):
@@ -365,25 +602,37 @@ class BinanceDataFeed:
         if self.ws:
             asyncio.create_task(self.ws.close())
     
-    def get_dataframe(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
+    def get_dataframe(self, symbol: str, timeframe: str, parse_time: bool = False) -> Optional[pd.DataFrame]:
         """Get current candle data as DataFrame"""
-        return self.buffer.get_dataframe(symbol.upper(), timeframe)
+        return self.buffer.get_dataframe(symbol.upper(), timeframe, parse_time)
     
     def get_latest(self, symbol: str, timeframe: str) -> Optional[Dict]:
         """Get latest candle"""
         return self.buffer.get_latest(symbol.upper(), timeframe)
+    
+    def get_latest_batch(self, symbols: List[str], timeframe: str) -> Dict[str, float]:
+        """Get latest close price for each symbol"""
+        return self.buffer.get_latest_closes([s.upper() for s in symbols], timeframe)
 
 
 class SimulatedDataFeed:
     """Simulated data feed for testing without WebSocket - with REST API fallback"""
     
+    RETRY_BASE_DELAY = 5.0   # seconds before a failed (symbol, tf) fetch is probed again
+    RETRY_MAX_DELAY = 300.0  # cap for the doubling backoff
+    
     def __init__(self, symbols: List[str], timeframes: List[str] = ["15m", "1h"]):
         self.symbols = [s.upper() for s in symbols]
         self.timeframes = timeframes
-        self.buffer = CandleBuffer()
-        self.callbacks: List[Callable] = []
+        self.buffer = CandleBuffer(symbols=self.symbols, timeframes=timeframes)
+        self.callbacks: Tuple[Callable, ...] = ()  # rebuilt by add_callback
+        self._safe_cbs: Tuple[Callable, ...] = ()  # callbacks pre-wrapped in _safe_call
         self.running = False
         
+        # Failed fetches parked for retry: (symbol, tf, next_try_ts), newest on top
+        self._retry_stack: List[Tuple[str, str, float]] = []
+        self._retry_delay: Dict[Tuple[str, str], float] = {}
+        
         # Try python-binance first, fallback to REST API
         self.client = None
         self.use_rest_fallback = False
@@ -392,6 +641,7 @@ class SimulatedDataFeed:
         if BINANCE_AVAILABLE:
             try:
                 self.client = Client(BINANCE_API_KEY, BINANCE_API_SECRET, {"timeout": 30})
+                _pool_client_session(self.client)
                 logger.info("✅ Binance client created successfully")
             except Exception as e:
                 logger.warning(f"⚠️ python-binance client failed: {e}, using REST fallback")
@@ -401,52 +651,102 @@ class SimulatedDataFeed:
             self.use_rest_fallback = True
     
     def add_callback(self, callback: Callable):
-        self.callbacks.append(callback)
+        self.callbacks = self.callbacks + (callback,)
+        self._safe_cbs = self._safe_cbs + (functools.partial(_safe_call, callback),)
     
     def _notify_callbacks(self, symbol: str, timeframe: str, candle: Dict, is_closed: bool):
-        for cb in self.callbacks:
-            try:
-                cb(symbol, timeframe, candle, is_closed)
-            except Exception as e:
-                logger.error(f"Callback error: {e}")
+        cbs = self._safe_cbs
+        if len(cbs) == 1:
+            cbs[0](symbol, timeframe, candle, is_closed)
+            return
+        for cb in cbs:
+            cb(symbol, timeframe, candle, is_closed)
     
     def fetch_latest(self):
-        """Fetch latest candles from REST API"""
+        """Fetch latest candles from REST API
+        
+        Fetches that failed on an earlier poll are parked on a LIFO retry stack and
+        skipped by the regular round; due ones are probed one at a time, newest first,
+        with a per-(symbol, tf) doubling delay, so an outage is not hit by every
+        symbol at once when it ends. A probe that fails again goes below the others
+        still due, so one dead symbol can't keep the rest parked.
+        """
         logger.info(f"Fetching data for {len(self.symbols)} symbols (REST fallback: {self.use_rest_fallback})...")
         
-        for symbol in self.symbols:
-            for tf in self.timeframes:
+        # Everything parked at the start of the poll is either probed here or left alone
+        parked = {(symbol, tf) for symbol, tf, _ in self._retry_stack}
+        now = time.monotonic()
+        self._probe_retries(now)
+        
+        jobs = [(symbol, tf) for symbol in self.symbols for tf in self.timeframes if (symbol, tf) not in parked]
+        if not jobs:
+            return
+        
+        # Requests run concurrently; results are inserted on this thread as they arrive
+        with ThreadPoolExecutor(max_workers=max(1, min(MAX_FETCH_WORKERS, len(jobs)))) as pool:
+            futures = {pool.submit(self._fetch_klines, symbol, tf): (symbol, tf) for symbol, tf in jobs}
+            for future in as_completed(futures):
+                symbol, tf = futures[future]
                 try:
-                    # Use REST API fallback or python-binance client
-                    if self.use_rest_fallback or not self.client:
-                        klines = fetch_klines_rest(symbol, tf, 200)
-                    else:
-                        klines = self.client.futures_klines(
-                            symbol=symbol,
-                            interval=tf,
-                            limit=200
-                        )
-                    
-                    if klines:
-                        for k in klines:
-                            candle = {
-                                'timestamp': k[0],
-                                'open': float(k[1]),
-                                'high': float(k[2]),
-                                'low': float(k[3]),
-                                'close': float(k[4]),
-                                'volume': float(k[5])
-                            }
-                            self.buffer.add_candle(symbol, tf, candle)
-                        
-                        # Notify for latest candle
-                        self._notify_callbacks(symbol, tf, candle, True)
-                        logger.info(f"✅ {symbol} {tf}: {len(klines)} candles loaded")
-                    else:
-                        logger.warning(f"⚠️ {symbol} {tf}: No data returned")
-                        
+                    ok = self._load_klines(symbol, tf, future.result())
                 except Exception as e:
                     logger.error(f"❌ Fetch error for {symbol} {tf}: {e}")
+                    ok = False
+                
+                if not ok:
+                    self._retry_delay[(symbol, tf)] = self.RETRY_BASE_DELAY
+                    self._retry_stack.append((symbol, tf, now + self.RETRY_BASE_DELAY))
+    
+    def _probe_retries(self, now: float):
+        """Retry due fetches, topmost first, until one still fails"""
+        stack = self._retry_stack
+        while True:
+            i = next((k for k in range(len(stack) - 1, -1, -1) if stack[k][2] <= now), None)
+            if i is None:
+                return
+            symbol, tf, _ = stack.pop(i)
+            key = (symbol, tf)
+            try:
+                ok = self._load_klines(symbol, tf, self._fetch_klines(symbol, tf))
+            except Exception as e:
+                logger.error(f"❌ Retry failed for {symbol} {tf}: {e}")
+                ok = False
+            
+            if ok:
+                del self._retry_delay[key]
+                continue
+            
+            # Still down - back off this one, requeued below every entry still due so
+            # those are probed before it next time, and leave the rest parked
+            delay = min(self._retry_delay[key] * 2, self.RETRY_MAX_DELAY)
+            self._retry_delay[key] = delay
+            pos = next((k for k, entry in enumerate(stack) if entry[2] <= now), len(stack))
+            stack.insert(pos, (symbol, tf, now + delay))
+            return
+    
+    def _load_klines(self, symbol: str, tf: str, klines: list) -> bool:
+        """Insert fetched klines and notify for the latest candle; False if nothing came back"""
+        if not klines:
+            logger.warning(f"⚠️ {symbol} {tf}: No data returned")
+            return False
+        
+        ts, ohlcv = _parse_klines(klines)
+        self.buffer.bulk_add(symbol, tf, ts, ohlcv)
+        
+        # Notify for latest candle
+        self._notify_callbacks(symbol, tf, self.buffer.get_latest(symbol, tf), True)
+        logger.info(f"✅ {symbol} {tf}: {len(klines)} candles loaded")
+        return True
+    
+    def _fetch_klines(self, symbol: str, tf: str, limit: int = 200) -> list:
+        """Fetch klines via REST API fallback or python-binance client"""
+        if self.use_rest_fallback or not self.client:
+            return fetch_klines_rest(symbol, tf, limit)
+        return self.client.futures_klines(
+            symbol=symbol,
+            interval=tf,
+            limit=limit
+        )
     
     def start(self, interval_seconds: int = 60):
         """Start polling (blocking)"""
@@ -455,7 +755,6 @@ class SimulatedDataFeed:
         
         self.fetch_latest()
         
-        import time
         while self.running:
             time.sleep(interval_seconds)
             self.fetch_latest()
@@ -464,11 +763,14 @@ class SimulatedDataFeed:
     def stop(self):
         self.running = False
     
-    def get_dataframe(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
-        return self.buffer.get_dataframe(symbol.upper(), timeframe)
+    def get_dataframe(self, symbol: str, timeframe: str, parse_time: bool = False) -> Optional[pd.DataFrame]:
+        return self.buffer.get_dataframe(symbol.upper(), timeframe, parse_time)
     
     def get_latest(self, symbol: str, timeframe: str) -> Optional[Dict]:
         return self.buffer.get_latest(symbol.upper(), timeframe)
+    
+    def get_latest_batch(self, symbols: List[str], timeframe: str) -> Dict[str, float]:
+        return self.buffer.get_latest_closes([s.upper() for s in symbols], timeframe)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 """Diagnose why bot isn't taking positions - UPDATED with relaxed conditions"""
 import sys
+from concurrent.futures import ThreadPoolExecutor
 sys.path.insert(0, '.')
 
 from data_feed import SimulatedDataFeed
@@ -14,23 +15,26 @@ print('Fetching data...')
 feed.fetch_latest()
 print('Data fetched!\n')
 
-for sym in symbols:
+
+def diagnose_one(sym: str) -> str:
+    """Run the signal diagnostics for one symbol and return the report text"""
     df_1h = feed.get_dataframe(sym, '1h')
     df_15m = feed.get_dataframe(sym, '15m')
     
     if df_1h is None or df_15m is None:
-        print(f'{sym}: NO DATA - symbol may not be available')
-        continue
+        return f'{sym}: NO DATA - symbol may not be available'
     
-    direction = engine.get_1h_direction(df_1h)
+    out = []
     calc = IndicatorCalculator()
-    df_1h_calc = calc.add_1h_indicators(df_1h)
-    df = calc.add_15m_indicators(df_15m)
-    row = df.iloc[-1]
-    prev = df.iloc[-2]
-    r = df_1h_calc.iloc[-1]
+    # The trend row is the one the engine decided on; only too-short history needs its own pass
+    direction, r = engine.get_1h_trend(df_1h, sym)
+    if r is None:
+        r = {col: a[-1] for col, a in calc.add_1h_indicators(df_1h).items()}
+    ind = calc.add_15m_indicators(df_15m)
+    row = {col: a[-1] for col, a in ind.items()}
+    prev = {col: a[-2] for col, a in ind.items()}
     
-    print(f'=== {sym} ===')
+    out.append(f'=== {sym} ===')
     trend = 'BULLISH' if direction == 1 else 'BEARISH' if direction == -1 else 'NEUTRAL'
     
     # Show 1H analysis
@@ -40,8 +44,8 @@ for sym in symbols:
     ema_partial_up = r['EMA_8'] > r['EMA_21']
     ema_partial_down = r['EMA_8'] < r['EMA_21']
     
-    print(f'1H Analysis: SuperTrend={st_dir} | EMA Stack Up={ema_stack_up} Down={ema_stack_down}')
-    print(f'1H Direction: {trend} (RELAXED: EMA stack OR (ST + partial EMA))')
+    out.append(f'1H Analysis: SuperTrend={st_dir} | EMA Stack Up={ema_stack_up} Down={ema_stack_down}')
+    out.append(f'1H Direction: {trend} (RELAXED: EMA stack OR (ST + partial EMA))')
     
     if direction == 1:
         # RELAXED 15m BUY conditions
@@ -50,16 +54,16 @@ for sym in symbols:
         macd_up = row['MACD'] > row['MACD_sig'] or row['MACD'] > prev['MACD']
         candle_up = row['body'] > 0
         vol_ok = row['vol_ratio'] > 0.5  # Relaxed from 0.7
-        print(f'  15m BUY Conditions:')
-        print(f'    near_ema={near_ema} (dist: {row["dist_ema13"]:.2f}%, need -2.0 to 1.5)')
-        print(f'    rsi_ok={rsi_ok} (RSI: {row["RSI"]:.1f}, need 30-70)')
-        print(f'    macd_up={macd_up}')
-        print(f'    candle_up={candle_up} (body: {row["body"]:.2f})')
-        print(f'    vol_ok={vol_ok} (ratio: {row["vol_ratio"]:.2f}, need >0.5)')
+        out.append(f'  15m BUY Conditions:')
+        out.append(f'    near_ema={near_ema} (dist: {row["dist_ema13"]:.2f}%, need -2.0 to 1.5)')
+        out.append(f'    rsi_ok={rsi_ok} (RSI: {row["RSI"]:.1f}, need 30-70)')
+        out.append(f'    macd_up={macd_up}')
+        out.append(f'    candle_up={candle_up} (body: {row["body"]:.2f})')
+        out.append(f'    vol_ok={vol_ok} (ratio: {row["vol_ratio"]:.2f}, need >0.5)')
         score = sum([near_ema, rsi_ok, macd_up, candle_up, vol_ok])
-        print(f'  SCORE: {score}/5 (need >= 2 for entry)')
+        out.append(f'  SCORE: {score}/5 (need >= 2 for entry)')
         if score >= 2:
-            print(f'  >>> WOULD ENTER LONG <<<')
+            out.append(f'  >>> WOULD ENTER LONG <<<')
     elif direction == -1:
         # RELAXED 15m SELL conditions
         near_ema = -1.5 < row['dist_ema13'] < 2.0  # Relaxed from -0.5 to 1.0
@@ -67,18 +71,26 @@ for sym in symbols:
         macd_down = row['MACD'] < row['MACD_sig'] or row['MACD'] < prev['MACD']
         candle_down = row['body'] < 0
         vol_ok = row['vol_ratio'] > 0.5  # Relaxed from 0.7
-        print(f'  15m SELL Conditions:')
-        print(f'    near_ema={near_ema} (dist: {row["dist_ema13"]:.2f}%, need -1.5 to 2.0)')
-        print(f'    rsi_ok={rsi_ok} (RSI: {row["RSI"]:.1f}, need 30-70)')
-        print(f'    macd_down={macd_down}')
-        print(f'    candle_down={candle_down} (body: {row["body"]:.2f})')
-        print(f'    vol_ok={vol_ok} (ratio: {row["vol_ratio"]:.2f}, need >0.5)')
+        out.append(f'  15m SELL Conditions:')
+        out.append(f'    near_ema={near_ema} (dist: {row["dist_ema13"]:.2f}%, need -1.5 to 2.0)')
+        out.append(f'    rsi_ok={rsi_ok} (RSI: {row["RSI"]:.1f}, need 30-70)')
+        out.append(f'    macd_down={macd_down}')
+        out.append(f'    candle_down={candle_down} (body: {row["body"]:.2f})')
+        out.append(f'    vol_ok={vol_ok} (ratio: {row["vol_ratio"]:.2f}, need >0.5)')
         score = sum([near_ema, rsi_ok, macd_down, candle_down, vol_ok])
-        print(f'  SCORE: {score}/5 (need >= 2 for entry)')
+        out.append(f'  SCORE: {score}/5 (need >= 2 for entry)')
         if score >= 2:
-            print(f'  >>> WOULD ENTER SHORT <<<')
+            out.append(f'  >>> WOULD ENTER SHORT <<<')
     else:
-        print('  NEUTRAL - no clear trend (conflicting signals)')
-        print(f'    For BULLISH: need EMA stack OR (ST UP + EMA8>EMA21)')
-        print(f'    For BEARISH: need EMA stack OR (ST DOWN + EMA8<EMA21)')
-    print()
+        out.append('  NEUTRAL - no clear trend (conflicting signals)')
+        out.append(f'    For BULLISH: need EMA stack OR (ST UP + EMA8>EMA21)')
+        out.append(f'    For BEARISH: need EMA stack OR (ST DOWN + EMA8<EMA21)')
+    out.append('')
+    return '\n'.join(out)
+
+
+# Indicators run on already-fetched DataFrames, so symbols are analysed in parallel
+# (output is still printed in symbol order)
+with ThreadPoolExecutor(max_workers=len(symbols)) as pool:
+    for report in pool.map(diagnose_one, symbols):
+        print(report)
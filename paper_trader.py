@@ -8,19 +8,50 @@ Tracks positions, calculates P&L, and logs all trades.
 ================================================================================
 """
 
+import functools
 import json
 import logging
 import os
+import queue
+import threading
 from datetime import datetime
-from typing import Callable, Dict, List, Optional
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 import numpy as np
 
+try:
+    from live._exit_kernel import check_exit
+except ImportError:
+    from _exit_kernel import check_exit
+
+if TYPE_CHECKING:
+    from signal_engine import Signal
+
+# Fast JSON for the trade log (stdlib json fallback)
+try:
+    import orjson
+    
+    def _json_line(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
+    
+    json_loads = orjson.loads
+except ImportError:
+    def _numpy_default(obj):
+        """Encode numpy scalars/arrays like orjson's OPT_SERIALIZE_NUMPY does"""
+        if isinstance(obj, (np.generic, np.ndarray)):
+            return obj.tolist()
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    
+    def _json_line(obj) -> bytes:
+        return (json.dumps(obj, default=_numpy_default) + "\n").encode()
+    
+    json_loads = json.loads
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("PaperTrader")
 
 
-@dataclass
+@dataclass(slots=True)
 class Position:
     symbol: str
     direction: str  # BUY or SELL
@@ -33,9 +64,10 @@ class Position:
     trail_pct: float
     max_pnl_pct: float = 0.0
     hold_candles: int = 0
+    direction_sign: float = 1.0  # +1 BUY / -1 SELL
 
 
-@dataclass
+@dataclass(slots=True)
 class Trade:
     symbol: str
     direction: str
@@ -51,16 +83,79 @@ class Trade:
     conviction: float
 
 
+@dataclass(slots=True, frozen=True)
+class TradeEvent:
+    """Payload passed to trade callbacks on OPEN / CLOSE"""
+    symbol: str
+    direction: str
+    entry_price: float = 0.0
+    exit_price: float = 0.0
+    margin: float = 0.0
+    leverage: int = 0
+    pnl: float = 0.0
+    reason: str = ""
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TradeEvent":
+        """Build from an event dict (older callers)"""
+        return cls(**{k: data[k] for k in cls.__dataclass_fields__ if k in data})
+
+
+def _safe_call(callback: Callable, *args):
+    """Run a trade callback, logging (not raising) its errors"""
+    try:
+        callback(*args)
+    except Exception as e:
+        logger.error(f"Callback error: {e}")
+
+
+def read_trade_log(path: str) -> List[Dict]:
+    """Read a trade log file: a JSON-Lines stream (.jsonl) or an older JSON array (.json)"""
+    with open(path, 'rb') as f:
+        if path.endswith('.jsonl'):
+            return [json_loads(line) for line in f if line.strip()]
+        return json_loads(f.read())
+
+
 class PaperTrader:
     """Paper trading engine for strategy validation"""
     
+    # Open positions are mirrored as parallel arrays so exit checks can run vectorized
+    # over every open position at once. Each position gets a slot id (its row); ids of
+    # closed positions go on a free-list and are reused, so rows never move.
+    _SOA_FIELDS = (
+        ("_ep", np.float64),     # entry price
+        ("_tp", np.float64),     # take-profit price
+        ("_sl", np.float64),     # stop-loss price
+        ("_trail", np.float64),  # trailing stop distance
+        ("_sign", np.float64),   # +1 long / -1 short
+        ("_maxp", np.float64),   # best P&L % seen
+        ("_hold", np.int32),     # candles held
+    )
+    _EXIT_REASONS = np.array(["", "TP", "SL", "TRAIL", "TIMEOUT"], dtype=object)
+    ROUND_TRIP_COST = 0.0008  # fees as a fraction of notional
+    
     def __init__(self, starting_balance: float = 100000.0, min_leverage: int = 10, max_leverage: int = 50):
         self.starting_balance = starting_balance
         self.balance = starting_balance
         
         self.positions: Dict[str, Position] = {}  # symbol -> position
+        self._sym_ids: Dict[str, int] = {}  # symbol -> slot id
+        self._id_syms: List[Optional[str]] = []  # slot id -> symbol (None when free)
+        self._free_ids: List[int] = []
+        for name, dtype in self._SOA_FIELDS:
+            setattr(self, name, np.zeros(8, dtype))
         self.trades: List[Trade] = []
+        
+        # Running trade stats, updated on each close (get_stats never rescans self.trades)
+        self._n_win = self._n_loss = 0
+        self._sum_win = self._sum_loss = self._sum_pnl = 0.0
         self.callbacks: List[Callable] = []
+        self._frozen_callbacks: Optional[Tuple[Callable, ...]] = None  # set by freeze_callbacks
+        
+        # Single-listener fast paths: cb(event), called directly
+        self._open_cb: Optional[Callable] = None
+        self._close_cb: Optional[Callable] = None
         
         # Trading parameters
         self.risk_per_trade = 0.02  # 2% per trade for larger balance
@@ -76,165 +171,283 @@ class PaperTrader:
         # Simulated slippage
         self.slippage_pct = 0.0005  # 0.05%
         
+        # Price multipliers derived from the percentages above
+        self._tp_up, self._tp_dn = 1 + self.tp_pct, 1 - self.tp_pct
+        self._sl_up, self._sl_dn = 1 + self.sl_pct, 1 - self.sl_pct
+        self._slip_up, self._slip_dn = 1 + self.slippage_pct, 1 - self.slippage_pct
+        
         # Trade log file
         self.log_dir = "results/paper_trades"
         os.makedirs(self.log_dir, exist_ok=True)
+        self._log_date = ""  # YYYY-MM-DD of _log_file_path
+        self._log_file_path = ""
+        
+        # Trade records waiting to be appended, drained by the writer thread
+        self._log_queue: "queue.Queue[Optional[Tuple[str, Dict]]]" = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
     
     def add_callback(self, callback: Callable):
-        """Add callback for trade events"""
+        """Add callback for trade events: cb(event_type, event), errors are logged
+        
+        Undoes freeze_callbacks; call it again once wiring is done.
+        """
         self.callbacks.append(callback)
+        self._frozen_callbacks = None
     
-    def _notify_callbacks(self, event_type: str, data: Dict):
+    def freeze_callbacks(self, catch_errors: bool = True):
+        """Snapshot the add_callback listeners into a tuple for _notify_callbacks
+        
+        Each listener is pre-wrapped in _safe_call, so the dispatch loop itself has no
+        try/except; with catch_errors=False listener errors propagate instead.
+        """
+        if catch_errors:
+            self._frozen_callbacks = tuple(functools.partial(_safe_call, cb) for cb in self.callbacks)
+        else:
+            self._frozen_callbacks = tuple(self.callbacks)
+    
+    def set_open_callback(self, callback: Optional[Callable]):
+        """Set the OPEN listener: cb(event), called inline - errors are logged, not raised"""
+        self._open_cb = callback
+    
+    def set_close_callback(self, callback: Optional[Callable]):
+        """Set the CLOSE listener: cb(event), called inline after the trade is logged - errors are logged, not raised"""
+        self._close_cb = callback
+    
+    def _notify_callbacks(self, event_type: str, data: TradeEvent):
         """Notify callbacks of trade events"""
-        for cb in self.callbacks:
-            try:
+        cbs = self._frozen_callbacks
+        if cbs is not None:
+            for cb in cbs:
                 cb(event_type, data)
-            except Exception as e:
-                logger.error(f"Callback error: {e}")
+            return
+        
+        for cb in self.callbacks:
+            _safe_call(cb, event_type, data)
     
     def get_position(self, symbol: str) -> Optional[Position]:
         """Get current position for symbol"""
-        return self.positions.get(symbol)
+        position = self.positions.get(symbol)
+        if position is not None:
+            # Running state lives in the arrays; without a row yet (or any more)
+            # the Position's own fields stand
+            i = self._sym_ids.get(symbol)
+            if i is not None:
+                position.max_pnl_pct = float(self._maxp[i])
+                position.hold_candles = int(self._hold[i])
+        return position
+    
+    def _add_row(self, position: Position):
+        """Fill a slot (a free one if any) for a newly opened position"""
+        if self._free_ids:
+            i = self._free_ids.pop()
+            self._id_syms[i] = position.symbol
+        else:
+            i = len(self._id_syms)
+            self._id_syms.append(position.symbol)
+            if i == len(self._ep):
+                for name, _ in self._SOA_FIELDS:
+                    arr = getattr(self, name)
+                    setattr(self, name, np.concatenate([arr, np.zeros_like(arr)]))
+        
+        self._ep[i] = position.entry_price
+        self._tp[i] = position.tp_price
+        self._sl[i] = position.sl_price
+        self._trail[i] = position.trail_pct
+        self._sign[i] = position.direction_sign
+        self._maxp[i] = position.max_pnl_pct
+        self._hold[i] = position.hold_candles
+        self._sym_ids[position.symbol] = i
+    
+    def _remove_row(self, symbol: str):
+        """Release a closed position's slot"""
+        i = self._sym_ids.pop(symbol)
+        self._id_syms[i] = None
+        self._free_ids.append(i)
     
     def has_position(self, symbol: str) -> bool:
         """Check if we have a position for symbol"""
         return symbol in self.positions
     
-    def open_position(self, signal: Dict) -> bool:
-        """Open a new position based on signal"""
-        symbol = signal['symbol']
+    def open_position(self, signal: "Signal", now_iso: Optional[str] = None) -> bool:
+        """Open a new position based on signal
+        
+        now_iso: entry timestamp (datetime.isoformat()); callers processing a batch
+        pass one shared value, otherwise the current time is used.
+        """
+        if isinstance(signal, dict):
+            # signal_engine (pandas) is only imported for dict callers
+            try:
+                from live.signal_engine import Signal
+            except ImportError:
+                from signal_engine import Signal
+            signal = Signal.from_dict({"conviction": 0.5, "atr_pct": 1.0, **signal})
+        symbol = signal.symbol
         
         if self.has_position(symbol):
             logger.warning(f"Already have position for {symbol}")
             return False
         
-        direction = signal['signal']
+        direction = signal.signal
         if direction not in ['BUY', 'SELL']:
             return False
         
-        price = signal['price']
-        conviction = signal.get('conviction', 0.5)
-        atr_pct = signal.get('atr_pct', 1.0)
+        price = signal.price
+        conviction = signal.conviction
+        atr_pct = signal.atr_pct
         
-        # Apply slippage
+        # Apply slippage, calculate exit prices
         if direction == 'BUY':
-            entry_price = price * (1 + self.slippage_pct)
+            sign = 1.0
+            entry_price = price * self._slip_up
+            tp_price = entry_price * self._tp_up
+            sl_price = entry_price * self._sl_dn
         else:
-            entry_price = price * (1 - self.slippage_pct)
+            sign = -1.0
+            entry_price = price * self._slip_dn
+            tp_price = entry_price * self._tp_dn
+            sl_price = entry_price * self._sl_up
         
         # Calculate position size (scale with balance)
         base_margin = self.balance * self.risk_per_trade * (0.5 + conviction * 0.5)
         max_margin = self.balance * 0.05  # Max 5% per trade
-        margin = np.clip(base_margin, 100, max_margin)
+        margin = min(max(base_margin, 100.0), max_margin)
         
         # Calculate leverage
         leverage = int(self.min_leverage + conviction * (self.max_leverage - self.min_leverage))
-        leverage = np.clip(leverage, self.min_leverage, self.max_leverage)
-        
-        # Calculate exit prices
-        if direction == 'BUY':
-            tp_price = entry_price * (1 + self.tp_pct)
-            sl_price = entry_price * (1 - self.sl_pct)
-        else:
-            tp_price = entry_price * (1 - self.tp_pct)
-            sl_price = entry_price * (1 + self.sl_pct)
+        leverage = min(max(leverage, self.min_leverage), self.max_leverage)
         
         # Create position
         position = Position(
             symbol=symbol,
             direction=direction,
             entry_price=entry_price,
-            entry_time=datetime.now().isoformat(),
+            entry_time=now_iso or datetime.now().isoformat(),
             leverage=leverage,
             margin=margin,
             tp_price=tp_price,
             sl_price=sl_price,
-            trail_pct=self.trail_pct
+            trail_pct=self.trail_pct,
+            direction_sign=sign
         )
         
+        # Row first, then publish: readers that find the position also find its row
+        self._add_row(position)
         self.positions[symbol] = position
         
-        logger.info(f"OPENED {direction} {symbol} @ {entry_price:.2f} | Margin: ${margin:.2f} | Lev: {leverage}x")
-        
-        self._notify_callbacks("OPEN", {
-            "symbol": symbol,
-            "direction": direction,
-            "entry_price": entry_price,
-            "margin": margin,
-            "leverage": leverage
-        })
+        logger.info("OPENED %s %s @ %.2f | Margin: $%.2f | Lev: %dx", direction, symbol, entry_price, margin, leverage)
+        
+        cb = self._open_cb
+        if cb is not None or self.callbacks:
+            event = TradeEvent(
+                symbol=symbol,
+                direction=direction,
+                entry_price=entry_price,
+                margin=margin,
+                leverage=leverage
+            )
+            if cb is not None:
+                _safe_call(cb, event)
+            if self.callbacks:
+                self._notify_callbacks("OPEN", event)
         
         return True
     
-    def update_position(self, symbol: str, current_price: float) -> Optional[str]:
+    def update_position(self, symbol: str, current_price: float, now_iso: Optional[str] = None) -> Optional[str]:
         """Update position and check for exit conditions"""
-        if not self.has_position(symbol):
+        i = self._sym_ids.get(symbol)
+        if i is None:
             return None
         
-        position = self.positions[symbol]
-        position.hold_candles += 1
-        
-        # Calculate current P&L
-        if position.direction == 'BUY':
-            pnl_pct = (current_price - position.entry_price) / position.entry_price
-        else:
-            pnl_pct = (position.entry_price - current_price) / position.entry_price
-        
-        # Update max P&L for trailing stop
-        position.max_pnl_pct = max(position.max_pnl_pct, pnl_pct)
+        hold = int(self._hold[i]) + 1
+        self._hold[i] = hold
         
-        # Check exit conditions
-        exit_reason = None
-        
-        # Take Profit
-        if position.direction == 'BUY' and current_price >= position.tp_price:
-            exit_reason = "TP"
-        elif position.direction == 'SELL' and current_price <= position.tp_price:
-            exit_reason = "TP"
+        code, self._maxp[i] = check_exit(
+            float(self._sign[i]), float(self._ep[i]), float(self._tp[i]), float(self._sl[i]),
+            float(self._trail[i]), self.max_hold_candles,
+            float(current_price), float(self._maxp[i]), hold
+        )
         
-        # Stop Loss
-        elif position.direction == 'BUY' and current_price <= position.sl_price:
-            exit_reason = "SL"
-        elif position.direction == 'SELL' and current_price >= position.sl_price:
-            exit_reason = "SL"
+        if code:
+            exit_reason = self._EXIT_REASONS[code]
+            self.close_position(symbol, current_price, exit_reason, now_iso)
+            return exit_reason
         
-        # Trailing Stop
-        elif position.max_pnl_pct > position.trail_pct:
-            if pnl_pct < position.max_pnl_pct - position.trail_pct:
-                exit_reason = "TRAIL"
+        return None
+    
+    def update_positions(self, prices: Dict[str, float], now_iso: Optional[str] = None) -> Dict[str, str]:
+        """Update all positions in `prices` (symbol -> current price) in one vectorized pass
         
-        # Timeout
-        elif position.hold_candles >= self.max_hold_candles:
-            exit_reason = "TIMEOUT"
+        Returns symbol -> exit reason for the positions that were closed.
+        """
+        symbols = list(prices)
+        return self.process_tick(symbols, np.fromiter(prices.values(), dtype=np.float64, count=len(symbols)), now_iso)
+    
+    def process_tick(self, symbols: List[str], prices: np.ndarray, now_iso: Optional[str] = None) -> Dict[str, str]:
+        """Exit checks for one tick: prices[i] is the current price of symbols[i]
+        
+        Symbols without an open position are ignored. Returns symbol -> exit reason
+        for the positions that were closed.
+        """
+        get_id = self._sym_ids.get
+        ids = np.fromiter((get_id(s, -1) for s in symbols), dtype=np.intp, count=len(symbols))
+        keep = np.flatnonzero(ids >= 0)
+        if not len(keep):
+            return {}
+        
+        idx = ids[keep]
+        px = np.asarray(prices, dtype=np.float64)[keep]
+        
+        sign = self._sign[idx]
+        trail_pct = self._trail[idx]
+        
+        hold = self._hold[idx] + 1
+        self._hold[idx] = hold
+        
+        # Current P&L, and max P&L for the trailing stop
+        pnl = sign * (px - self._ep[idx]) / self._ep[idx]
+        maxp = np.maximum(self._maxp[idx], pnl)
+        self._maxp[idx] = maxp
+        
+        # Exit conditions, in priority order: TP, SL, trailing stop, timeout.
+        # Once the trail is armed it takes the slot - timeout is not checked.
+        tp_hit = sign * (px - self._tp[idx]) >= 0
+        sl_hit = sign * (self._sl[idx] - px) >= 0
+        trail_armed = maxp > trail_pct
+        trail_hit = pnl < maxp - trail_pct
+        timeout = hold >= self.max_hold_candles
+        
+        codes = np.select(
+            [tp_hit, sl_hit, trail_armed, timeout],
+            [1, 2, np.where(trail_hit, 3, 0), 4],
+            0
+        )
         
-        if exit_reason:
-            self.close_position(symbol, current_price, exit_reason)
-            return exit_reason
+        exits = {}
+        for j in np.flatnonzero(codes):
+            symbol = self._id_syms[idx[j]]
+            reason = self._EXIT_REASONS[codes[j]]
+            self.close_position(symbol, float(px[j]), reason, now_iso)
+            exits[symbol] = reason
         
-        return None
+        return exits
     
-    def close_position(self, symbol: str, exit_price: float, reason: str):
+    def close_position(self, symbol: str, exit_price: float, reason: str, now_iso: Optional[str] = None):
         """Close position and record trade"""
         if not self.has_position(symbol):
             return
         
+        now_iso = now_iso or datetime.now().isoformat()
         position = self.positions[symbol]
         
         # Apply slippage
-        if position.direction == 'BUY':
-            actual_exit = exit_price * (1 - self.slippage_pct)
-            pnl_pct = (actual_exit - position.entry_price) / position.entry_price
-        else:
-            actual_exit = exit_price * (1 + self.slippage_pct)
-            pnl_pct = (position.entry_price - actual_exit) / position.entry_price
-        
-        # Calculate P&L
-        leveraged_pnl = pnl_pct * position.leverage
-        gross_pnl = position.margin * leveraged_pnl
+        sign = position.direction_sign
+        actual_exit = exit_price * (self._slip_dn if sign > 0 else self._slip_up)
+        pnl_pct = sign * (actual_exit - position.entry_price) / position.entry_price
         
-        # Trading costs (0.08% round trip)
-        costs = position.margin * position.leverage * 0.0008
-        net_pnl = gross_pnl - costs
+        # Calculate P&L, net of trading costs (0.08% round trip on the notional)
+        notional = position.margin * position.leverage
+        net_pnl = notional * (pnl_pct - self.ROUND_TRIP_COST)
         
         # Update balance
         self.balance += net_pnl
@@ -246,7 +459,7 @@ class PaperTrader:
             entry_price=position.entry_price,
             exit_price=actual_exit,
             entry_time=position.entry_time,
-            exit_time=datetime.now().isoformat(),
+            exit_time=now_iso,
             leverage=position.leverage,
             margin=position.margin,
             pnl=round(net_pnl, 2),
@@ -256,42 +469,123 @@ class PaperTrader:
         )
         
         self.trades.append(trade)
-        del self.positions[symbol]
-        
-        pnl_color = "+" if net_pnl >= 0 else ""
-        logger.info(f"CLOSED {position.direction} {symbol} @ {actual_exit:.2f} | {reason} | P&L: {pnl_color}${net_pnl:.2f} ({pnl_pct*100:.2f}%)")
-        
-        self._notify_callbacks("CLOSE", {
-            "symbol": symbol,
-            "direction": position.direction,
-            "exit_price": actual_exit,
-            "pnl": net_pnl,
-            "reason": reason
-        })
-        
-        # Save trade log
-        self._save_trade(trade)
+        self._record_stats(trade.pnl)
+        del self.positions[symbol]  # unpublish before the row goes away
+        self._remove_row(symbol)
+        
+        logger.info("CLOSED %s %s @ %.2f | %s | P&L: %s$%.2f (%.2f%%)", position.direction, symbol, actual_exit,
+                    reason, "+" if net_pnl >= 0 else "", net_pnl, pnl_pct * 100)
+        
+        # Save trade log before any listener runs
+        self._save_trade(trade, now_iso)
+        
+        cb = self._close_cb
+        if cb is not None or self.callbacks:
+            event = TradeEvent(
+                symbol=symbol,
+                direction=position.direction,
+                entry_price=position.entry_price,
+                exit_price=actual_exit,
+                margin=position.margin,
+                leverage=position.leverage,
+                pnl=net_pnl,
+                reason=reason
+            )
+            if cb is not None:
+                _safe_call(cb, event)
+            if self.callbacks:
+                self._notify_callbacks("CLOSE", event)
     
-    def _save_trade(self, trade: Trade):
-        """Save trade to log file"""
-        log_file = os.path.join(self.log_dir, f"trades_{datetime.now().strftime('%Y%m%d')}.json")
-        
-        trades_data = []
-        if os.path.exists(log_file):
-            try:
-                with open(log_file, 'r') as f:
-                    trades_data = json.load(f)
-            except:
-                pass
-        
-        trades_data.append(asdict(trade))
-        
-        with open(log_file, 'w') as f:
-            json.dump(trades_data, f, indent=2)
+    def _save_trade(self, trade: Trade, now_iso: Optional[str] = None):
+        """Queue trade for the day's JSON-Lines log file (written by the writer thread)"""
+        date = (now_iso or datetime.now().isoformat())[:10]
+        if date != self._log_date:
+            # Day rolled over - new file name
+            self._log_date = date
+            self._log_file_path = os.path.join(self.log_dir, f"trades_{date.replace('-', '')}.jsonl")
+        
+        self._ensure_writer()
+        self._log_queue.put_nowait((self._log_file_path, asdict(trade)))
+    
+    def stop(self, timeout: float = 10.0):
+        """Flush queued trade records and stop the writer thread"""
+        writer = self._writer
+        if writer is None or not writer.is_alive():
+            return
+        self._log_queue.put_nowait(None)
+        writer.join(timeout=timeout)
+    
+    def _ensure_writer(self):
+        """Start the writer thread on first use"""
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._write_loop, name="TradeLogWriter", daemon=True)
+                self._writer.start()
+    
+    def _write_loop(self):
+        """Writer loop - append queued records until a None sentinel arrives"""
+        while True:
+            item = self._log_queue.get()
+            stop = item is None
+            
+            # Take whatever else is already queued and append it per file in one go
+            lines: Dict[str, List[bytes]] = {}
+            while item is not None:
+                path, record = item
+                lines.setdefault(path, []).append(_json_line(record))
+                try:
+                    item = self._log_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+            
+            for path, chunk in lines.items():
+                try:
+                    with open(path, 'ab') as f:
+                        f.write(b"".join(chunk))
+                except OSError as e:
+                    logger.error(f"Trade log write failed ({path}): {e}")
+            
+            if stop:
+                return
+    
+    def _record_stats(self, pnl: float):
+        """Fold a closed trade's (rounded) P&L into the running stats"""
+        self._sum_pnl += pnl
+        if pnl > 0:
+            self._n_win += 1
+            self._sum_win += pnl
+        else:
+            self._n_loss += 1
+            self._sum_loss -= pnl
+    
+    def rebuild_stats(self):
+        """Recompute the running stats from self.trades in one pass
+        
+        For when self.trades was edited or restored directly instead of through
+        close_position.
+        """
+        n_win = n_loss = 0
+        sum_win = sum_loss = sum_pnl = 0.0
+        for t in self.trades:
+            pnl = t.pnl
+            sum_pnl += pnl
+            if pnl > 0:
+                n_win += 1
+                sum_win += pnl
+            else:
+                n_loss += 1
+                sum_loss -= pnl
+        
+        self._n_win, self._n_loss = n_win, n_loss
+        self._sum_win, self._sum_loss, self._sum_pnl = sum_win, sum_loss, sum_pnl
     
     def get_stats(self) -> Dict:
         """Get trading statistics"""
-        n = len(self.trades)
+        n = self._n_win + self._n_loss
         if n == 0:
             return {
                 "total_trades": 0,
@@ -299,25 +593,22 @@ class PaperTrader:
                 "return_pct": 0
             }
         
-        winners = [t for t in self.trades if t.pnl > 0]
-        losers = [t for t in self.trades if t.pnl <= 0]
-        
-        win_rate = len(winners) / n * 100
-        total_win = sum(t.pnl for t in winners)
-        total_loss = abs(sum(t.pnl for t in losers))
+        win_rate = self._n_win / n * 100
+        total_win = self._sum_win
+        total_loss = abs(self._sum_loss)
         pf = total_win / total_loss if total_loss > 0 else float('inf')
         
         ret = (self.balance - self.starting_balance) / self.starting_balance * 100
         
         return {
             "total_trades": n,
-            "winners": len(winners),
-            "losers": len(losers),
+            "winners": self._n_win,
+            "losers": self._n_loss,
             "win_rate": round(win_rate, 2),
             "profit_factor": round(pf, 2) if pf != float('inf') else "inf",
-            "total_pnl": round(sum(t.pnl for t in self.trades), 2),
-            "avg_win": round(total_win / len(winners), 2) if winners else 0,
-            "avg_loss": round(-total_loss / len(losers), 2) if losers else 0,
+            "total_pnl": round(self._sum_pnl, 2),
+            "avg_win": round(total_win / self._n_win, 2) if self._n_win else 0,
+            "avg_loss": round(-total_loss / self._n_loss, 2) if self._n_loss else 0,
             "balance": round(self.balance, 2),
             "return_pct": round(ret, 2)
         }
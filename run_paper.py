@@ -17,6 +17,7 @@ import argparse
 import asyncio
 import logging
 import sys
+import time
 import signal as sig
 from datetime import datetime
 from typing import Dict
@@ -27,13 +28,13 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Try importing from live/ folder (local), fallback to root (HF)
 try:
-    from live.data_feed import BinanceDataFeed, SimulatedDataFeed
+    from live.data_feed import BinanceDataFeed, SimulatedDataFeed, run_event_loop
     from live.signal_engine import SignalEngine
     from live.paper_trader import PaperTrader
     from live.dashboard import DashboardManager
     from live.alerts import AlertManager, TelegramAlert
 except ImportError:
-    from data_feed import BinanceDataFeed, SimulatedDataFeed
+    from data_feed import BinanceDataFeed, SimulatedDataFeed, run_event_loop
     from signal_engine import SignalEngine
     from paper_trader import PaperTrader
     from dashboard import DashboardManager
@@ -46,11 +47,15 @@ logger = logging.getLogger("PaperRunner")
 class RealTimeTradingSystem:
     """Real-time paper trading system with WebSocket"""
     
+    RENDER_INTERVAL = 0.25  # min seconds between dashboard renders from candle callbacks
+    
     def __init__(self, symbols: list, balance: float = 100000.0, min_lev: int = 10, max_lev: int = 50):
         self.symbols = symbols
         self.running = False
         self.min_lev = min_lev
         self.max_lev = max_lev
+        self._last_render = 0.0
+        self._render_pending = False
         
         # Initialize components
         logger.info("Initializing REAL-TIME paper trading system...")
@@ -74,9 +79,9 @@ class RealTimeTradingSystem:
         # Data feed callback - process on each candle update
         def on_candle(symbol, timeframe, candle, is_closed):
             if is_closed:
-                logger.info(f"[CANDLE] {symbol} {timeframe} closed @ {candle['close']:.2f}")
+                logger.info("[CANDLE] %s %s closed @ %.2f", symbol, timeframe, candle['close'])
                 self.process_candle(symbol)
-                self.dashboard.render()
+                self._render_throttled()
         
         self.data_feed.add_callback(on_candle)
         
@@ -84,47 +89,76 @@ class RealTimeTradingSystem:
         self.signal_engine.add_callback(self.alerts.on_signal)
         
         # Paper trader -> alerts
-        def on_trade_event(event_type, data):
-            if event_type == "OPEN":
-                self.alerts.on_trade_open(data)
-            elif event_type == "CLOSE":
-                self.alerts.on_trade_close(data)
-                self.dashboard.on_trade(data)
-        
-        self.paper_trader.add_callback(on_trade_event)
+        def on_trade_close(data):
+            self.alerts.on_trade_close(data)
+            self.dashboard.on_trade(data)
+        
+        self.paper_trader.set_open_callback(self.alerts.on_trade_open)
+        self.paper_trader.set_close_callback(on_trade_close)
+        self.paper_trader.freeze_callbacks()
+    
+    def _render_throttled(self):
+        """Render the dashboard at most once per RENDER_INTERVAL
+        
+        Candles for several symbols/timeframes close together; instead of rendering
+        for each, later ones are covered by a single trailing render.
+        """
+        if self._render_pending:
+            return
+        delay = self._last_render + self.RENDER_INTERVAL - time.monotonic()
+        if delay <= 0:
+            self._render()
+        else:
+            self._render_pending = True
+            asyncio.get_running_loop().call_later(delay, self._render)
+    
+    def _render(self):
+        self._render_pending = False
+        self._last_render = time.monotonic()
+        self.dashboard.render()
     
     def process_candle(self, symbol: str):
         """Process new candle for a symbol"""
+        self.process_candles([symbol])
+    
+    def process_candles(self, symbols: list):
+        """Process new candles for several symbols
         
-        # Get data
-        df_1h = self.data_feed.get_dataframe(symbol, "1h")
-        df_15m = self.data_feed.get_dataframe(symbol, "15m")
+        Exit checks for all open positions only need the latest price and run as one
+        batch; the signal path (which needs the DataFrames) stays per symbol.
+        """
         
-        if df_1h is None or df_15m is None:
-            return
+        # One timestamp for every trade event in this batch
+        now_iso = datetime.now().isoformat()
         
-        # Get latest price
-        latest = self.data_feed.get_latest(symbol, "15m")
-        if latest:
-            current_price = latest['close']
-        else:
-            return
+        # Get latest prices (symbols without data are left out)
+        prices = self.data_feed.get_latest_batch(symbols, "15m")
+        
+        # Check existing positions
+        exits = self.paper_trader.update_positions(prices, now_iso)
         
-        # Check existing position
-        if self.paper_trader.has_position(symbol):
-            exit_reason = self.paper_trader.update_position(symbol, current_price)
+        for symbol, current_price in prices.items():
+            if symbol in exits:
+                continue
             
-            if not exit_reason:
+            if self.paper_trader.has_position(symbol):
                 # Update dashboard with position
                 pos = self.paper_trader.get_position(symbol)
-                if pos:
-                    self.dashboard.on_position_update(symbol, {
-                        'entry_price': pos.entry_price,
-                        'current_price': current_price,
-                        'direction': pos.direction,
-                        'hold_candles': pos.hold_candles
-                    })
-        else:
+                self.dashboard.on_position_update(symbol, {
+                    'entry_price': pos.entry_price,
+                    'current_price': current_price,
+                    'direction': pos.direction,
+                    'hold_candles': pos.hold_candles
+                })
+                continue
+            
+            # Get data
+            df_1h = self.data_feed.get_dataframe(symbol, "1h")
+            df_15m = self.data_feed.get_dataframe(symbol, "15m")
+            
+            if df_1h is None or df_15m is None:
+                continue
+            
             # Generate signal
             signal = self.signal_engine.process(symbol, df_1h, df_15m)
             
@@ -132,10 +166,10 @@ class RealTimeTradingSystem:
             self.dashboard.on_signal(signal)
             
             # Open position if signal
-            if signal['signal'] in ['BUY', 'SELL']:
-                signal['price'] = current_price
-                signal['atr_pct'] = 1.0  # Default
-                self.paper_trader.open_position(signal)
+            if signal.signal in ['BUY', 'SELL']:
+                signal.price = current_price
+                signal.atr_pct = 1.0  # Default
+                self.paper_trader.open_position(signal, now_iso)
         
         # Update stats
         stats = self.paper_trader.get_stats()
@@ -151,12 +185,11 @@ class RealTimeTradingSystem:
         logger.info("Starting REAL-TIME trading with WebSocket...")
         logger.info("Fetching initial historical data...")
         
-        # Fetch initial data
-        self.data_feed.fetch_initial_data(days=7)
+        # Fetch initial data (worker thread, keeps the event loop free)
+        await self.data_feed.fetch_initial_data_async(days=7)
         
         # Process each symbol initially
-        for symbol in self.symbols:
-            self.process_candle(symbol.upper())
+        self.process_candles([s.upper() for s in self.symbols])
         
         # Render initial dashboard
         self.dashboard.render()
@@ -168,7 +201,7 @@ class RealTimeTradingSystem:
     def run(self):
         """Run the system (blocking)"""
         try:
-            asyncio.run(self.run_async())
+            run_event_loop(self.run_async())
         except KeyboardInterrupt:
             logger.info("Shutting down...")
             self.stop()
@@ -178,12 +211,14 @@ class RealTimeTradingSystem:
         self.running = False
         self.data_feed.stop()
         
-        # Print final summary
+        # Flush the trade log and print final summary
+        self.paper_trader.stop()
         self.paper_trader.print_summary()
         
         # Send final alert
         stats = self.paper_trader.get_stats()
         self.alerts.send_daily_summary(stats)
+        self.alerts.close()
 
 
 class PollingTradingSystem:
@@ -210,53 +245,54 @@ class PollingTradingSystem:
     def _setup_callbacks(self):
         self.signal_engine.add_callback(self.alerts.on_signal)
         
-        def on_trade_event(event_type, data):
-            if event_type == "OPEN":
-                self.alerts.on_trade_open(data)
-            elif event_type == "CLOSE":
-                self.alerts.on_trade_close(data)
-                self.dashboard.on_trade(data)
+        def on_trade_close(data):
+            self.alerts.on_trade_close(data)
+            self.dashboard.on_trade(data)
         
-        self.paper_trader.add_callback(on_trade_event)
+        self.paper_trader.set_open_callback(self.alerts.on_trade_open)
+        self.paper_trader.set_close_callback(on_trade_close)
+        self.paper_trader.freeze_callbacks()
     
     def process_candle(self, symbol: str):
-        df_1h = self.data_feed.get_dataframe(symbol, "1h")
-        df_15m = self.data_feed.get_dataframe(symbol, "15m")
-        
-        if df_1h is None or df_15m is None:
-            return
-        
-        latest = self.data_feed.get_latest(symbol, "15m")
-        if latest:
-            current_price = latest['close']
-        else:
-            return
-        
-        if self.paper_trader.has_position(symbol):
-            exit_reason = self.paper_trader.update_position(symbol, current_price)
-            if not exit_reason:
+        self.process_candles([symbol])
+    
+    def process_candles(self, symbols: list):
+        now_iso = datetime.now().isoformat()
+        prices = self.data_feed.get_latest_batch(symbols, "15m")
+        exits = self.paper_trader.update_positions(prices, now_iso)
+        
+        for symbol, current_price in prices.items():
+            if symbol in exits:
+                continue
+            
+            if self.paper_trader.has_position(symbol):
                 pos = self.paper_trader.get_position(symbol)
-                if pos:
-                    self.dashboard.on_position_update(symbol, {
-                        'entry_price': pos.entry_price,
-                        'current_price': current_price,
-                        'direction': pos.direction,
-                        'hold_candles': pos.hold_candles
-                    })
-        else:
+                self.dashboard.on_position_update(symbol, {
+                    'entry_price': pos.entry_price,
+                    'current_price': current_price,
+                    'direction': pos.direction,
+                    'hold_candles': pos.hold_candles
+                })
+                continue
+            
+            df_1h = self.data_feed.get_dataframe(symbol, "1h")
+            df_15m = self.data_feed.get_dataframe(symbol, "15m")
+            
+            if df_1h is None or df_15m is None:
+                continue
+            
             signal = self.signal_engine.process(symbol, df_1h, df_15m)
             self.dashboard.on_signal(signal)
             
-            if signal['signal'] in ['BUY', 'SELL']:
-                signal['price'] = current_price
-                signal['atr_pct'] = 1.0
-                self.paper_trader.open_position(signal)
+            if signal.signal in ['BUY', 'SELL']:
+                signal.price = current_price
+                signal.atr_pct = 1.0
+                self.paper_trader.open_position(signal, now_iso)
         
         stats = self.paper_trader.get_stats()
         self.dashboard.on_stats_update(stats)
     
     def run(self):
-        import time
         self.running = True
         
         self.alerts.send_startup(self.symbols, self.paper_trader.balance)
@@ -265,27 +301,25 @@ class PollingTradingSystem:
         logger.info("Fetching initial data...")
         self.data_feed.fetch_latest()
         
-        for symbol in self.symbols:
-            self.process_candle(symbol)
+        self.process_candles(self.symbols)
         
         self.dashboard.render()
         
-        last_poll = datetime.now()
+        last_poll = time.monotonic()
         
         try:
             while self.running:
-                now = datetime.now()
+                # Sleep until the next poll is due
+                time.sleep(max(0.0, self.poll_interval - (time.monotonic() - last_poll)))
+                if not self.running:
+                    break
+                last_poll = time.monotonic()
                 
-                if (now - last_poll).total_seconds() >= self.poll_interval:
-                    self.data_feed.fetch_latest()
-                    
-                    for symbol in self.symbols:
-                        self.process_candle(symbol)
-                    
-                    self.dashboard.render()
-                    last_poll = now
+                self.data_feed.fetch_latest()
                 
-                time.sleep(1)
+                self.process_candles(self.symbols)
+                
+                self.dashboard.render()
                 
         except KeyboardInterrupt:
             logger.info("Shutting down...")
@@ -293,9 +327,11 @@ class PollingTradingSystem:
     
     def stop(self):
         self.running = False
+        self.paper_trader.stop()
         self.paper_trader.print_summary()
         stats = self.paper_trader.get_stats()
         self.alerts.send_daily_summary(stats)
+        self.alerts.close()
 
 
 def main():
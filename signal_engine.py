@@ -9,146 +9,424 @@ Generates trading signals in real-time using balanced strategy.
 """
 
 import logging
+import math
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 import pandas as pd
 import numpy as np
 
+try:
+    from live._njit import njit, NUMBA_AVAILABLE
+except ImportError:
+    from _njit import njit, NUMBA_AVAILABLE
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("SignalEngine")
 
 
+@dataclass(slots=True)
+class Signal:
+    """Result of SignalEngine.process, passed to signal callbacks"""
+    symbol: str
+    signal: str = "HOLD"        # BUY / SELL / HOLD
+    direction: str = ""         # BULLISH / BEARISH / NEUTRAL
+    score: int = 0
+    conviction: float = 0.0
+    price: float = 0.0
+    atr_pct: float = 0.0
+    reason: str = ""
+    timestamp: str = ""
+    
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Signal":
+        """Build from a signal dict (older callers)"""
+        return cls(**{k: data[k] for k in cls.__dataclass_fields__ if k in data})
+
+
+@njit(cache=True)
+def _supertrend_loop(close, upper, lower):
+    """Supertrend direction (+1 / -1, 0 for the first bar) from close and the ATR bands"""
+    n = len(close)
+    st = np.empty(n)
+    direction = np.zeros(n)
+    if n == 0:
+        return direction
+    st[0] = close[0]
+    
+    for i in range(1, n):
+        ub = upper[i]
+        if math.isnan(ub):
+            ub = st[i-1]
+        lb = lower[i]
+        if math.isnan(lb):
+            lb = st[i-1]
+        
+        if ub < st[i-1] or close[i-1] > st[i-1]:
+            st[i] = ub
+        else:
+            st[i] = st[i-1]
+        
+        if close[i] > st[i]:
+            if direction[i-1] != 1:
+                st[i] = lb
+            direction[i] = 1
+        else:
+            if direction[i-1] != -1:
+                st[i] = ub
+            direction[i] = -1
+    
+    return direction
+
+
+@njit(cache=True)
+def _ewm_fast(x, span):
+    """x.ewm(span=span, adjust=False).mean() as a plain recurrence seeded with x[0]"""
+    n = len(x)
+    out = np.empty(n)
+    if n == 0:
+        return out
+    a = 2.0 / (span + 1.0)
+    s = x[0]
+    out[0] = s
+    for i in range(1, n):
+        s = a * x[i] + (1.0 - a) * s
+        out[i] = s
+    return out
+
+
+# adjust=False EWM weights 2 / (span + 1) for the 15m indicators
+_A5 = 2.0 / 6.0
+_A13 = 2.0 / 14.0
+_A10 = 2.0 / 11.0   # RSI gain / loss
+_A8 = 2.0 / 9.0
+_A17 = 2.0 / 18.0
+_A9 = 2.0 / 10.0    # MACD signal
+
+
+@njit(cache=True)
+def _fused_15m(close):
+    """EMA_5, EMA_13, RSI(10), MACD(8/17) and its signal(9) in one pass over close
+    
+    Same adjust=False recurrence as pandas ewm, seeded with the first value.
+    """
+    n = len(close)
+    ema5 = np.empty(n)
+    ema13 = np.empty(n)
+    rsi = np.empty(n)
+    macd = np.empty(n)
+    macd_sig = np.empty(n)
+    if n == 0:
+        return ema5, ema13, rsi, macd, macd_sig
+    
+    e5 = e13 = e8 = e17 = close[0]
+    sig = 0.0
+    gain = 0.0
+    loss = 0.0
+    ema5[0] = e5
+    ema13[0] = e13
+    rsi[0] = 100.0 - 100.0 / (1.0 + gain / (loss + 1e-10))
+    macd[0] = 0.0
+    macd_sig[0] = 0.0
+    
+    for i in range(1, n):
+        x = close[i]
+        d = x - close[i-1]
+        e5 = _A5 * x + (1.0 - _A5) * e5
+        e13 = _A13 * x + (1.0 - _A13) * e13
+        e8 = _A8 * x + (1.0 - _A8) * e8
+        e17 = _A17 * x + (1.0 - _A17) * e17
+        gain = _A10 * (d if d > 0 else 0.0) + (1.0 - _A10) * gain
+        loss = _A10 * (-d if d < 0 else 0.0) + (1.0 - _A10) * loss
+        m = e8 - e17
+        sig = _A9 * m + (1.0 - _A9) * sig
+        
+        ema5[i] = e5
+        ema13[i] = e13
+        rsi[i] = 100.0 - 100.0 / (1.0 + gain / (loss + 1e-10))
+        macd[i] = m
+        macd_sig[i] = sig
+    
+    return ema5, ema13, rsi, macd, macd_sig
+
+
+def warm_up_kernels():
+    """Compile the numba kernels (or load them from the on-disk cache) before the first tick
+    
+    Called by SignalEngine when numba is installed; the Docker build runs it once
+    so the cache ships in the image.
+    """
+    x = np.linspace(1.0, 2.0, 4)
+    _supertrend_loop(x, x + 1.0, x - 1.0)
+    _fused_15m(x)
+    _ewm_fast(x, 8)
+
+
+def _true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """True range per bar; the first bar uses its own close as the previous close"""
+    prev_c = np.empty_like(close)
+    if len(close):
+        prev_c[0] = close[0]
+        prev_c[1:] = close[:-1]
+    return np.maximum(high - low, np.maximum(np.abs(high - prev_c), np.abs(low - prev_c)))
+
+
+def _rolling_mean(a: np.ndarray, w: int) -> np.ndarray:
+    """Trailing mean over w bars from a running sum (NaN for the first w-1 bars)"""
+    # One cumsum + one subtraction; ~3x faster than sliding_window_view(a, w).mean(-1)
+    # at 128-5000 bars since it doesn't re-add every window
+    c = np.empty(len(a) + 1)
+    c[0] = 0.0
+    np.cumsum(a, out=c[1:])
+    out = np.full(len(a), np.nan)
+    if len(a) >= w:
+        out[w-1:] = (c[w:] - c[:-w]) / w
+    return out
+
+
+def _last_values(ind: Dict[str, np.ndarray], columns: Tuple[str, ...]) -> Dict[str, float]:
+    """Last-row scalars of the given indicator columns"""
+    return {col: ind[col][-1] for col in columns}
+
+
+def _ffill_at(a: np.ndarray, i: int) -> float:
+    """a[i] with ffill().fillna(0) semantics, without sweeping the whole column"""
+    v = a[i]
+    if not math.isnan(v):
+        return v
+    valid = np.flatnonzero(~np.isnan(a[:i % len(a)]))
+    return a[valid[-1]] if len(valid) else 0.0
+
+
 class IndicatorCalculator:
     """Calculate indicators on DataFrame"""
     
     @staticmethod
-    def add_1h_indicators(df: pd.DataFrame) -> pd.DataFrame:
-        """Add 1hr trend indicators"""
-        df = df.copy()
+    def add_1h_indicators(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """1hr trend indicators as arrays aligned with df's rows (df is not modified)"""
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
+        ind = {}
         
         # EMAs
-        df['EMA_8'] = df['close'].ewm(span=8, adjust=False).mean()
-        df['EMA_21'] = df['close'].ewm(span=21, adjust=False).mean()
-        df['EMA_50'] = df['close'].ewm(span=50, adjust=False).mean()
+        ind['EMA_8'] = _ewm_fast(close, 8)
+        ind['EMA_21'] = _ewm_fast(close, 21)
+        ind['EMA_50'] = _ewm_fast(close, 50)
         
         # Supertrend
-        hl2 = (df['high'] + df['low']) / 2
-        tr = pd.concat([
-            df['high'] - df['low'],
-            abs(df['high'] - df['close'].shift(1)),
-            abs(df['low'] - df['close'].shift(1))
-        ], axis=1).max(axis=1)
-        atr = tr.rolling(10).mean().bfill()
+        hl2 = (high + low) / 2
+        atr = _rolling_mean(_true_range(high, low, close), 10)
+        if len(atr) >= 10:
+            atr[:9] = atr[9]  # back-fill the warm-up bars
         
         upper = hl2 + (2.5 * atr)
         lower = hl2 - (2.5 * atr)
         
-        n = len(df)
-        st = np.zeros(n)
-        direction = np.zeros(n)
-        st[0] = df['close'].iloc[0] if n > 0 else 0
+        ind['st_dir'] = _supertrend_loop(close, upper, lower)
         
-        for i in range(1, n):
-            ub = upper.iloc[i] if not pd.isna(upper.iloc[i]) else st[i-1]
-            lb = lower.iloc[i] if not pd.isna(lower.iloc[i]) else st[i-1]
-            
-            if ub < st[i-1] or df['close'].iloc[i-1] > st[i-1]:
-                st[i] = ub
-            else:
-                st[i] = st[i-1]
-            
-            if df['close'].iloc[i] > st[i]:
-                if direction[i-1] != 1:
-                    st[i] = lb
-                direction[i] = 1
-            else:
-                if direction[i-1] != -1:
-                    st[i] = ub
-                direction[i] = -1
-        
-        df['st_dir'] = direction
-        
-        return df
+        return ind
     
     @staticmethod
-    def add_15m_indicators(df: pd.DataFrame) -> pd.DataFrame:
-        """Add 15m entry indicators"""
-        df = df.copy()
-        
-        # Fast EMAs
-        df['EMA_5'] = df['close'].ewm(span=5, adjust=False).mean()
-        df['EMA_13'] = df['close'].ewm(span=13, adjust=False).mean()
-        
-        # RSI
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).ewm(span=10, adjust=False).mean()
-        loss = (-delta.where(delta < 0, 0)).ewm(span=10, adjust=False).mean()
-        df['RSI'] = 100 - (100 / (1 + gain / (loss + 1e-10)))
-        
-        # MACD
-        exp8 = df['close'].ewm(span=8, adjust=False).mean()
-        exp17 = df['close'].ewm(span=17, adjust=False).mean()
-        df['MACD'] = exp8 - exp17
-        df['MACD_sig'] = df['MACD'].ewm(span=9, adjust=False).mean()
+    def add_15m_indicators(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """15m entry indicators as arrays aligned with df's rows (df is not modified)"""
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
+        volume = df['volume'].to_numpy(dtype=np.float64)
+        ind = {}
+        
+        # Fast EMAs, RSI and MACD
+        ind['EMA_5'], ind['EMA_13'], ind['RSI'], ind['MACD'], ind['MACD_sig'] = _fused_15m(close)
         
         # ATR
-        high = df['high'].values
-        low = df['low'].values
-        close = df['close'].values
-        tr1 = pd.Series(high - low)
-        tr2 = pd.Series(np.abs(high - np.roll(close, 1)))
-        tr3 = pd.Series(np.abs(low - np.roll(close, 1)))
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        df['ATR'] = tr.rolling(10).mean()
-        df['ATR_pct'] = df['ATR'] / df['close'] * 100
+        ind['ATR'] = _rolling_mean(_true_range(high, low, close), 10)
+        ind['ATR_pct'] = ind['ATR'] / close * 100
         
         # Volume
-        df['vol_MA'] = df['volume'].rolling(12).mean()
-        df['vol_ratio'] = df['volume'] / (df['vol_MA'] + 1e-10)
+        ind['vol_MA'] = _rolling_mean(volume, 12)
+        ind['vol_ratio'] = volume / (ind['vol_MA'] + 1e-10)
         
         # Candle body
-        df['body'] = df['close'] - df['open']
+        ind['body'] = close - df['open'].to_numpy(dtype=np.float64)
         
         # Distance from EMA
-        df['dist_ema13'] = (df['close'] - df['EMA_13']) / df['EMA_13'] * 100
+        ind['dist_ema13'] = (close - ind['EMA_13']) / ind['EMA_13'] * 100
+        
+        return ind
+
+
+class IndicatorState:
+    """Streaming 15m entry indicators for one symbol
+    
+    Holds the EMA/RSI/MACD recurrences and the ATR / volume windows as of the
+    last closed bar, so evaluating the newest (possibly still forming) bar is
+    O(1) instead of a pass over the whole frame. Rebuilt from the frame on cold
+    start or whenever the bars no longer line up (gap, backfill, refetch).
+    """
+    
+    ATR_WINDOW = 10
+    VOL_WINDOW = 12
+    
+    __slots__ = ('last_bar_ts', 'close', 'ema5', 'ema13', 'ema8', 'ema17',
+                 'macd', 'macd_sig', 'rsi_gain', 'rsi_loss', 'tr_window', 'vol_window')
+    
+    def __init__(self):
+        self.last_bar_ts = None  # timestamp of the last bar folded into the state
+        self.close = 0.0
+        self.ema5 = self.ema13 = self.ema8 = self.ema17 = 0.0
+        self.macd = 0.0
+        self.macd_sig = 0.0
+        self.rsi_gain = 0.0
+        self.rsi_loss = 0.0
+        # Last N-1 closed bars; the newest bar completes the window
+        self.tr_window: deque = deque(maxlen=self.ATR_WINDOW - 1)
+        self.vol_window: deque = deque(maxlen=self.VOL_WINDOW - 1)
+    
+    def _next(self, high: float, low: float, close: float) -> Tuple[float, ...]:
+        """Recurrence values after one more bar, without touching the state"""
+        prev_c = self.close
+        d = close - prev_c
+        ema5 = _A5 * close + (1.0 - _A5) * self.ema5
+        ema13 = _A13 * close + (1.0 - _A13) * self.ema13
+        ema8 = _A8 * close + (1.0 - _A8) * self.ema8
+        ema17 = _A17 * close + (1.0 - _A17) * self.ema17
+        gain = _A10 * (d if d > 0 else 0.0) + (1.0 - _A10) * self.rsi_gain
+        loss = _A10 * (-d if d < 0 else 0.0) + (1.0 - _A10) * self.rsi_loss
+        macd = ema8 - ema17
+        macd_sig = _A9 * macd + (1.0 - _A9) * self.macd_sig
+        tr = max(high - low, abs(high - prev_c), abs(low - prev_c))
+        return ema5, ema13, ema8, ema17, gain, loss, macd, macd_sig, tr
+    
+    def _push(self, high: float, low: float, close: float, volume: float):
+        """Fold a closed bar into the state"""
+        (self.ema5, self.ema13, self.ema8, self.ema17, self.rsi_gain, self.rsi_loss,
+         self.macd, self.macd_sig, tr) = self._next(high, low, close)
+        self.close = close
+        self.tr_window.append(tr)
+        self.vol_window.append(volume)
+    
+    def _rebuild(self, high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray, end: int):
+        """Reset and replay bars [0, end) - the EWMs are seeded with the first bar"""
+        self.tr_window.clear()
+        self.vol_window.clear()
+        c0 = float(close[0])
+        self.close = self.ema5 = self.ema13 = self.ema8 = self.ema17 = c0
+        self.macd = self.macd_sig = self.rsi_gain = self.rsi_loss = 0.0
+        self.tr_window.append(float(high[0] - low[0]))
+        self.vol_window.append(float(volume[0]))
+        for h, l, c, v in zip(high[1:end].tolist(), low[1:end].tolist(),
+                              close[1:end].tolist(), volume[1:end].tolist()):
+            self._push(h, l, c, v)
+    
+    def update(self, df: pd.DataFrame) -> Tuple[Dict[str, float], float]:
+        """Indicator values for the last bar of df, plus the previous bar's MACD
         
-        return df
+        Every bar but the last is treated as closed. Needs at least 3 rows.
+        """
+        ts = df['timestamp'].to_numpy()
+        high = df['high'].to_numpy(dtype=np.float64)
+        low = df['low'].to_numpy(dtype=np.float64)
+        close = df['close'].to_numpy(dtype=np.float64)
+        volume = df['volume'].to_numpy(dtype=np.float64)
+        
+        if self.last_bar_ts != ts[-2]:
+            if self.last_bar_ts == ts[-3]:
+                # One new bar since last time - the old last bar is now closed
+                self._push(float(high[-2]), float(low[-2]), float(close[-2]), float(volume[-2]))
+            else:
+                self._rebuild(high, low, close, volume, len(close) - 1)
+            self.last_bar_ts = ts[-2]
+        
+        c = float(close[-1])
+        v = float(volume[-1])
+        ema5, ema13, _, _, gain, loss, macd, macd_sig, tr = self._next(float(high[-1]), float(low[-1]), c)
+        atr = (sum(self.tr_window) + tr) / self.ATR_WINDOW
+        vol_ma = (sum(self.vol_window) + v) / self.VOL_WINDOW
+        row = {
+            'close': c,
+            'EMA_5': ema5,
+            'EMA_13': ema13,
+            'RSI': 100 - (100 / (1 + gain / (loss + 1e-10))),
+            'MACD': macd,
+            'MACD_sig': macd_sig,
+            'ATR': atr,
+            'ATR_pct': atr / c * 100,
+            'vol_MA': vol_ma,
+            'vol_ratio': v / (vol_ma + 1e-10),
+            'body': c - float(df['open'].iat[-1]),
+            'dist_ema13': (c - ema13) / ema13 * 100,
+        }
+        return row, self.macd
 
 
 class SignalEngine:
     """Real-time signal generation engine"""
     
+    # Only the newest bars feed the indicators; EMAs forget their seed within ~4x
+    # their span (EMA_50 -> 200 bars, MACD_sig over EMA_17 -> ~100 bars)
+    MAX_1H_BARS = 256
+    MAX_15M_BARS = 128
+    
+    # Last-row columns read by the trend and entry checks
+    TREND_COLUMNS = ('st_dir', 'EMA_8', 'EMA_21', 'EMA_50')
+    ENTRY_COLUMNS = ('close', 'dist_ema13', 'RSI', 'MACD', 'MACD_sig', 'body', 'vol_ratio', 'ATR_pct')
+    
     def __init__(self):
+        if NUMBA_AVAILABLE:
+            warm_up_kernels()
         self.calc = IndicatorCalculator()
         self.callbacks: List[Callable] = []
-        self.last_signals: Dict[str, Dict] = {}  # symbol -> last signal
+        self.last_signals: Dict[str, Signal] = {}  # symbol -> last signal
+        self._last_sig_str: Dict[str, str] = {}  # symbol -> last BUY / SELL / HOLD, for change detection
         
         # Track last signal time to avoid duplicates
         self.last_signal_time: Dict[str, datetime] = {}
+        
+        # symbol -> (input 1h frame, its indicators); the feed hands out the same
+        # frame object until a new candle arrives, so identity means unchanged data
+        self._ind_1h_cache: Dict[str, Tuple[pd.DataFrame, Dict[str, np.ndarray]]] = {}
+        
+        # symbol -> streaming 15m indicators
+        self._state_15m: Dict[str, IndicatorState] = {}
     
     def add_callback(self, callback: Callable):
         """Add callback for signal events"""
         self.callbacks.append(callback)
     
-    def _notify_callbacks(self, signal: Dict):
+    def _notify_callbacks(self, signal: Signal):
         """Notify all callbacks of new signal"""
         for cb in self.callbacks:
             try:
                 cb(signal)
             except Exception as e:
-                logger.error(f"Callback error: {e}")
+                logger.error("Callback error: %s", e)
     
-    def get_1h_direction(self, df_1h: pd.DataFrame) -> int:
+    def _get_1h_indicators(self, df_1h: pd.DataFrame, symbol: str = "") -> Dict[str, np.ndarray]:
+        """1hr indicators, reused while the feed returns the same input frame"""
+        cached = self._ind_1h_cache.get(symbol)
+        if cached is not None and cached[0] is df_1h:
+            return cached[1]
+        ind = self.calc.add_1h_indicators(df_1h.iloc[-self.MAX_1H_BARS:])
+        self._ind_1h_cache[symbol] = (df_1h, ind)
+        return ind
+    
+    def get_1h_direction(self, df_1h: pd.DataFrame, symbol: str = "") -> int:
         """Get trend direction from 1hr data - RELAXED VERSION
         
         Uses SuperTrend OR EMA stack (instead of requiring both).
         Also considers partial EMA alignment.
         """
+        return self.get_1h_trend(df_1h, symbol)[0]
+    
+    def get_1h_trend(self, df_1h: pd.DataFrame, symbol: str = "") -> Tuple[int, Optional[Dict[str, float]]]:
+        """get_1h_direction plus the last-row values it was decided on (None if too little data)"""
         if df_1h is None or len(df_1h) < 50:
-            return 0
+            return 0, None
         
-        df = self.calc.add_1h_indicators(df_1h)
-        row = df.iloc[-1]
+        ind = self._get_1h_indicators(df_1h, symbol)
+        row = _last_values(ind, self.TREND_COLUMNS)
         
         st_up = row['st_dir'] == 1
         st_down = row['st_dir'] == -1
@@ -166,36 +444,43 @@ class SignalEngine:
         bearish = ema_down or (st_down and ema_partial_down)
         
         if bullish and not bearish:
-            return 1  # Bullish
+            return 1, row  # Bullish
         elif bearish and not bullish:
-            return -1  # Bearish
+            return -1, row  # Bearish
         else:
-            return 0  # Neutral (conflicting or no signal)
+            return 0, row  # Neutral (conflicting or no signal)
     
     def check_15m_entry(self, df_15m: pd.DataFrame, direction: int, symbol: str = "") -> Dict:
         """Check for entry opportunity on 15m"""
         if df_15m is None or len(df_15m) < 30:
             return {"signal": "HOLD", "reason": "Insufficient data"}
         
-        df = self.calc.add_15m_indicators(df_15m)
-        df = df.ffill().fillna(0)
-        
-        row = df.iloc[-1]
-        prev = df.iloc[-2] if len(df) > 1 else row
+        df_15m = df_15m.iloc[-self.MAX_15M_BARS:]
+        if symbol:
+            # Streaming path - O(1) per tick once the state is warm
+            state = self._state_15m.get(symbol)
+            if state is None:
+                state = self._state_15m[symbol] = IndicatorState()
+            row, prev_macd = state.update(df_15m)
+        else:
+            ind = self.calc.add_15m_indicators(df_15m)
+            ind['close'] = df_15m['close'].to_numpy(dtype=np.float64)
+            row = {col: _ffill_at(ind[col], -1) for col in self.ENTRY_COLUMNS}
+            prev_macd = _ffill_at(ind['MACD'], -2)
         
         # RELAXED Entry conditions (widened EMA distance, lowered score threshold)
         if direction == 1:  # Looking for BUY
             near_ema = -2.0 < row['dist_ema13'] < 1.5  # Relaxed from -1.0 to 0.5
             rsi_ok = 30 < row['RSI'] < 70  # Relaxed from 35-65
-            macd_up = row['MACD'] > row['MACD_sig'] or row['MACD'] > prev['MACD']
+            macd_up = row['MACD'] > row['MACD_sig'] or row['MACD'] > prev_macd
             candle_up = row['body'] > 0
             vol_ok = row['vol_ratio'] > 0.5  # Relaxed from 0.7
             
-            conditions = [near_ema, rsi_ok, macd_up, candle_up, vol_ok]
-            score = sum(conditions)
+            score = int(near_ema) + int(rsi_ok) + int(macd_up) + int(candle_up) + int(vol_ok)
             
             # Log condition status for debugging
-            logger.info(f"📊 {symbol} BUY CHECK: near_ema={near_ema}({row['dist_ema13']:.2f}%) rsi={rsi_ok}({row['RSI']:.1f}) macd={macd_up} candle={candle_up} vol={vol_ok}({row['vol_ratio']:.2f}) => {score}/5")
+            logger.info("📊 %s BUY CHECK: near_ema=%s(%.2f%%) rsi=%s(%.1f) macd=%s candle=%s vol=%s(%.2f) => %s/5",
+                        symbol, near_ema, row['dist_ema13'], rsi_ok, row['RSI'], macd_up, candle_up, vol_ok, row['vol_ratio'], score)
             
             if score >= 2:  # Relaxed from 3
                 return {
@@ -216,15 +501,15 @@ class SignalEngine:
         elif direction == -1:  # Looking for SELL
             near_ema = -1.5 < row['dist_ema13'] < 2.0  # Relaxed from -0.5 to 1.0
             rsi_ok = 30 < row['RSI'] < 70  # Relaxed from 35-65
-            macd_down = row['MACD'] < row['MACD_sig'] or row['MACD'] < prev['MACD']
+            macd_down = row['MACD'] < row['MACD_sig'] or row['MACD'] < prev_macd
             candle_down = row['body'] < 0
             vol_ok = row['vol_ratio'] > 0.5  # Relaxed from 0.7
             
-            conditions = [near_ema, rsi_ok, macd_down, candle_down, vol_ok]
-            score = sum(conditions)
+            score = int(near_ema) + int(rsi_ok) + int(macd_down) + int(candle_down) + int(vol_ok)
             
             # Log condition status for debugging
-            logger.info(f"📊 {symbol} SELL CHECK: near_ema={near_ema}({row['dist_ema13']:.2f}%) rsi={rsi_ok}({row['RSI']:.1f}) macd={macd_down} candle={candle_down} vol={vol_ok}({row['vol_ratio']:.2f}) => {score}/5")
+            logger.info("📊 %s SELL CHECK: near_ema=%s(%.2f%%) rsi=%s(%.1f) macd=%s candle=%s vol=%s(%.2f) => %s/5",
+                        symbol, near_ema, row['dist_ema13'], rsi_ok, row['RSI'], macd_down, candle_down, vol_ok, row['vol_ratio'], score)
             
             if score >= 2:  # Relaxed from 3
                 return {
@@ -244,58 +529,66 @@ class SignalEngine:
         
         return {"signal": "HOLD", "reason": f"Score {score}/5 < 2 required"}
     
-    def process(self, symbol: str, df_1h: pd.DataFrame, df_15m: pd.DataFrame) -> Dict:
+    def process(self, symbol: str, df_1h: pd.DataFrame, df_15m: pd.DataFrame) -> Signal:
         """Process data and generate signal"""
         
+        now_iso = datetime.now().isoformat()
+        
         # Get 1hr trend direction
-        direction = self.get_1h_direction(df_1h)
+        direction, row = self.get_1h_trend(df_1h, symbol)
         
         if direction == 0:
             # Log why trend is neutral for debugging
-            if df_1h is not None and len(df_1h) >= 50:
-                df = self.calc.add_1h_indicators(df_1h)
-                row = df.iloc[-1]
+            if row is not None and logger.isEnabledFor(logging.INFO):
                 st_dir = 'UP' if row['st_dir'] == 1 else 'DOWN' if row['st_dir'] == -1 else 'FLAT'
                 ema_up = row['EMA_8'] > row['EMA_21'] > row['EMA_50']
                 ema_down = row['EMA_8'] < row['EMA_21'] < row['EMA_50']
-                logger.info(f"⏸️ {symbol} NEUTRAL: ST={st_dir} EMA_stack_up={ema_up} EMA_stack_down={ema_down}")
+                logger.info("⏸️ %s NEUTRAL: ST=%s EMA_stack_up=%s EMA_stack_down=%s", symbol, st_dir, ema_up, ema_down)
+            
+            last = self.last_signals.get(symbol)
+            if last is not None and last.direction == "NEUTRAL":
+                # Still neutral - nothing changed but the time, so refresh the stored signal
+                last.timestamp = now_iso
+                return last
             
-            signal = {
-                "symbol": symbol,
-                "signal": "HOLD",
-                "direction": "NEUTRAL",
-                "reason": "No clear trend (ST and EMA not aligned)",
-                "timestamp": datetime.now().isoformat()
-            }
+            signal = Signal(
+                symbol=symbol,
+                signal="HOLD",
+                direction="NEUTRAL",
+                reason="No clear trend (ST and EMA not aligned)",
+                timestamp=now_iso
+            )
         else:
             trend_str = "BULLISH" if direction == 1 else "BEARISH"
-            logger.info(f"📈 {symbol} 1H TREND: {trend_str} - checking 15m entry...")
+            logger.info("📈 %s 1H TREND: %s - checking 15m entry...", symbol, trend_str)
             
             # Check 15m entry
             entry = self.check_15m_entry(df_15m, direction, symbol)
             
-            signal = {
-                "symbol": symbol,
-                "signal": entry.get("signal", "HOLD"),
-                "direction": trend_str,
-                "score": entry.get("score", 0),
-                "conviction": entry.get("conviction", 0),
-                "price": entry.get("price", 0),
-                "atr_pct": entry.get("atr_pct", 0),
-                "reason": entry.get("reason", ""),
-                "timestamp": datetime.now().isoformat()
-            }
+            signal = Signal(
+                symbol=symbol,
+                signal=entry.get("signal", "HOLD"),
+                direction=trend_str,
+                score=entry.get("score", 0),
+                conviction=entry.get("conviction", 0),
+                price=entry.get("price", 0),
+                atr_pct=entry.get("atr_pct", 0),
+                reason=entry.get("reason", ""),
+                timestamp=now_iso
+            )
         
         # Store and notify if signal changed
-        last = self.last_signals.get(symbol, {})
-        if signal['signal'] != last.get('signal', 'HOLD') and signal['signal'] != 'HOLD':
-            self._notify_callbacks(signal)
-            logger.info(f"🚀 SIGNAL: {symbol} {signal['signal']} @ {signal.get('price', 0):.2f} (score: {signal.get('score', 0)}/5)")
+        if signal.signal != self._last_sig_str.get(symbol, 'HOLD'):
+            self._last_sig_str[symbol] = signal.signal
+            if signal.signal != 'HOLD':
+                self._notify_callbacks(signal)
+                logger.info("🚀 SIGNAL: %s %s @ %.2f (score: %s/5)",
+                            symbol, signal.signal, signal.price, signal.score)
         
         self.last_signals[symbol] = signal
         return signal
     
-    def get_last_signal(self, symbol: str) -> Optional[Dict]:
+    def get_last_signal(self, symbol: str) -> Optional[Signal]:
         """Get the last signal for a symbol"""
         return self.last_signals.get(symbol)
 
@@ -324,4 +617,4 @@ if __name__ == "__main__":
         df_15m = feed.get_dataframe(sym, "15m")
         
         signal = engine.process(sym, df_1h, df_15m)
-        print(f"{sym}: {signal['signal']} - {signal.get('reason', signal.get('direction', ''))}")
+        print(f"{sym}: {signal.signal} - {signal.reason}")
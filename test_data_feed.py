@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+================================================================================
+                    DATA FEED TESTS
+================================================================================
+Retry-stack behaviour of SimulatedDataFeed.fetch_latest (no network; the
+kline fetch and the clock are patched). Run: python -m unittest test_data_feed
+================================================================================
+"""
+
+import unittest
+from unittest import mock
+
+import data_feed
+
+
+KLINE = [1000, "1", "2", "0.5", "1.5", "3"]
+
+
+class RetryStackTest(unittest.TestCase):
+    """A symbol that keeps failing must not keep the ones parked below it from refreshing"""
+    
+    def setUp(self):
+        self.feed = data_feed.SimulatedDataFeed(["AAA", "BBB"], ["15m"])
+        self.down = {"AAA"}
+        self.calls = []
+        self.now = 0.0
+        
+        def fetch(symbol, tf, limit=200):
+            self.calls.append(symbol)
+            if symbol in self.down:
+                raise IOError("endpoint down")
+            return [KLINE]
+        
+        self.feed._fetch_klines = fetch
+        patcher = mock.patch.object(data_feed.time, "monotonic", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        
+        # Both parked; AAA (on top) stays down, BBB below it has recovered
+        delay = self.feed.RETRY_BASE_DELAY
+        self.feed._retry_stack = [("BBB", "15m", delay), ("AAA", "15m", delay)]
+        self.feed._retry_delay = {("BBB", "15m"): delay, ("AAA", "15m"): delay}
+    
+    def test_failing_top_entry_does_not_starve_the_rest(self):
+        self.now = 6.0
+        self.feed.fetch_latest()
+        self.assertEqual(self.calls, ["AAA"])  # one probe per poll, newest first
+        
+        self.calls.clear()
+        self.now = 7.0
+        self.feed.fetch_latest()
+        self.assertEqual(self.calls, ["BBB"])
+        self.assertIsNotNone(self.feed.get_latest("BBB", "15m"))
+        self.assertNotIn(("BBB", "15m"), self.feed._retry_delay)
+        
+        # AAA stays parked with a doubled delay
+        self.assertEqual([entry[:2] for entry in self.feed._retry_stack], [("AAA", "15m")])
+        self.assertEqual(self.feed._retry_delay[("AAA", "15m")], 2 * self.feed.RETRY_BASE_DELAY)
+        
+        # Once recovered, BBB is back in the regular round
+        self.calls.clear()
+        self.now = 8.0
+        self.feed.fetch_latest()
+        self.assertEqual(self.calls, ["BBB"])
+
+
+if __name__ == "__main__":
+    unittest.main()